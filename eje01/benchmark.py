@@ -0,0 +1,171 @@
+"""
+Benchmark de lectura intensiva para Configuracion.
+Varios hilos lectores leen el par (idioma, zona_horaria) mientras un escritor
+alterna entre dos combinaciones válidas a un ritmo fijo (igual para todas las
+variantes, así comparan lecturas bajo la misma carga de escritura). Se comparan:
+  - instantanea: Configuracion con instantáneas inmutables (copy-on-write)
+  - lock: variante que protege cada lectura y escritura con un Lock
+  - ingenua: atributos sueltos sin sincronización (puede mezclar versiones)
+Se informa lecturas por segundo, lecturas "rotas" (pares que nunca existieron)
+y las escrituras por segundo que el escritor alcanzó realmente.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from main import Configuracion
+
+PARES: Tuple[Tuple[str, str], ...] = (("ES", "UTC-5"), ("EN", "UTC+12"))
+VALIDOS = set(PARES)
+
+
+class ConfiguracionConLock:
+    """Variante de referencia: un único Lock para lectores y escritores"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.idioma, self.zona_horaria = PARES[0]
+
+    def leer_par(self) -> Tuple[str, str]:
+        with self._lock:
+            return self.idioma, self.zona_horaria
+
+    def escribir_par(self, idioma: str, zona_horaria: str) -> None:
+        with self._lock:
+            self.idioma = idioma
+            self.zona_horaria = zona_horaria
+
+
+class ConfiguracionIngenua:
+    """Claves sueltas sin sincronización, leídas una por una: el lector puede ver medio cambio"""
+
+    def __init__(self) -> None:
+        self._valores = dict(zip(("idioma", "zona_horaria"), PARES[0]))
+
+    def obtener(self, clave: str) -> str:
+        return self._valores[clave]
+
+    def establecer(self, clave: str, valor: str) -> None:
+        self._valores[clave] = valor
+
+    def leer_par(self) -> Tuple[str, str]:
+        return self.obtener("idioma"), self.obtener("zona_horaria")
+
+    def escribir_par(self, idioma: str, zona_horaria: str) -> None:
+        self.establecer("idioma", idioma)
+        self.establecer("zona_horaria", zona_horaria)
+
+
+class ConfiguracionInstantanea:
+    """Adaptador sobre el Singleton real: lee siempre de una sola instantánea"""
+
+    def __init__(self) -> None:
+        self.config = Configuracion()
+        self.config.usar_archivo(None)
+        self.config.actualizar(idioma=PARES[0][0], zona_horaria=PARES[0][1])
+
+    def leer_par(self) -> Tuple[str, str]:
+        foto = self.config.instantanea()
+        return foto.idioma, foto.zona_horaria
+
+    def escribir_par(self, idioma: str, zona_horaria: str) -> None:
+        self.config.actualizar(idioma=idioma, zona_horaria=zona_horaria)
+
+
+VARIANTES: Dict[str, Callable[[], Any]] = {
+    "instantanea": ConfiguracionInstantanea,
+    "lock": ConfiguracionConLock,
+    "ingenua": ConfiguracionIngenua,
+}
+
+
+def ejecutar_variante(nombre: str, lectores: int, lecturas: int, escrituras_s: float) -> Dict[str, Any]:
+    """Corre `lectores` hilos de `lecturas` lecturas cada uno contra un escritor a `escrituras_s` por segundo"""
+    objetivo = VARIANTES[nombre]()
+    detener = threading.Event()
+    rotas = [0] * lectores
+    escrituras = [0]
+    periodo = 1 / escrituras_s if escrituras_s > 0 else 0.0
+
+    def escritor() -> None:
+        # Ritmo por plazos absolutos: una escritura lenta no baja la tasa objetivo
+        i = 0
+        siguiente = time.perf_counter()
+        while not detener.is_set():
+            i += 1
+            objetivo.escribir_par(*PARES[i % 2])
+            if periodo:
+                siguiente += periodo
+                espera = siguiente - time.perf_counter()
+                if espera > 0:
+                    detener.wait(espera)
+        escrituras[0] = i
+
+    def lector(indice: int) -> None:
+        leer_par = objetivo.leer_par
+        malas = 0
+        for _ in range(lecturas):
+            if leer_par() not in VALIDOS:
+                malas += 1
+        rotas[indice] = malas
+
+    hilo_escritor = threading.Thread(target=escritor, name="Escritor")
+    hilos = [threading.Thread(target=lector, args=(i,), name=f"Lector-{i}") for i in range(lectores)]
+    hilo_escritor.start()
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    detener.set()
+    hilo_escritor.join()
+    total = lectores * lecturas
+    return {
+        "variante": nombre,
+        "lectores": lectores,
+        "lecturas_s": total / duracion,
+        "rotas": sum(rotas),
+        "escrituras": escrituras[0],
+        "escrituras_s": escrituras[0] / duracion,
+    }
+
+
+def ejecutar_benchmark(variantes: List[str], hilos: List[int], lecturas: int,
+                       escrituras_s: float) -> List[Dict[str, Any]]:
+    """Imprime y devuelve una fila por (variante, número de lectores)"""
+    filas: List[Dict[str, Any]] = []
+    print("=" * 70)
+    print("CONFIGURACIÓN: LECTURAS CONCURRENTES CON UN ESCRITOR")
+    print("=" * 70)
+    for n in hilos:
+        for nombre in variantes:
+            fila = ejecutar_variante(nombre, n, lecturas, escrituras_s)
+            filas.append(fila)
+            print(f"{nombre:<12} lectores={n:>2} | {fila['lecturas_s']:>12,.0f} lecturas/s | "
+                  f"rotas: {fila['rotas']:>6} | escrituras: {fila['escrituras']} ({fila['escrituras_s']:,.0f}/s)")
+    return filas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variantes", nargs="+", choices=list(VARIANTES),
+                        default=["instantanea", "lock", "ingenua"])
+    parser.add_argument("--hilos", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--lecturas", type=int, default=100_000, help="Lecturas por hilo lector")
+    parser.add_argument("--escrituras-s", type=float, default=1000.0,
+                        help="Escrituras por segundo del escritor, iguales en todas las variantes (0 = sin límite)")
+    parser.add_argument("--intervalo-gil", type=float, default=1e-6,
+                        help="sys.setswitchinterval: valores chicos hacen visibles las lecturas rotas")
+    args = parser.parse_args()
+    sys.setswitchinterval(args.intervalo_gil)
+    ejecutar_benchmark(args.variantes, args.hilos, args.lecturas, args.escrituras_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,252 @@
 import sys
 import os
+import json
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:  # pragma: no cover - solo en intérpretes antiguos
+    tomllib = None
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from patrones import SingletonMeta
 
+class InstantaneaConfig:
+    """
+    Versión inmutable de la configuración
+    Cada clave es un atributo normal, así que leerla es una simple carga de atributo
+    El número de versión va en un slot aparte: una clave "version" del archivo o
+    del entorno no lo pisa (se lee con como_dict())
+    """
+
+    __slots__ = ("_version", "__dict__")
+
+    def __init__(self, version: int, valores: Dict[str, Any]):
+        object.__setattr__(self, "_version", version)
+        vars(self).update(valores)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __setattr__(self, nombre: str, valor: Any) -> None:
+        raise AttributeError("InstantaneaConfig es inmutable: use Configuracion.actualizar()")
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Copia de los valores (sin el número de versión)"""
+        return dict(vars(self))
+
+
 class Configuracion(metaclass=SingletonMeta):
-    """Clase Singleton para manejar la configuración global del sistema que almacena preferencias como idioma y zona horaria"""
+    """
+    Clase Singleton para manejar la configuración global del sistema que almacena preferencias como idioma y zona horaria
+    Los valores salen de variables de entorno (CONFIG_<CLAVE>), un archivo TOML/JSON/.env o los
+    valores por defecto; el archivo se lee recién en el primer acceso
+    Los datos viven en una InstantaneaConfig inmutable: los lectores la toman con una sola carga
+    de referencia y los escritores publican una nueva versión completa (copy-on-write)
+    Cada clave leída como atributo queda además en caché en la instancia, así las lecturas
+    posteriores no pasan por __getattr__; publicar una versión invalida las claves que cambiaron
+    """
+
+    VALORES_POR_DEFECTO: Dict[str, Any] = {"idioma": "ES", "zona_horaria": "UTC-5"}
+    PREFIJO_ENTORNO = "CONFIG_"
     
-    def __init__(self):
-        # Inicializamos
-        self.idioma: str = "ES"
-        self.zona_horaria: str = "UTC-5"
+    def __init__(self, ruta: Optional[str] = None):
+        # Inicializamos (los atributos internos empiezan con '_' para no confundirse con claves)
+        self._lock = threading.Lock()  # Solo lo usan los escritores
+        self._suscriptores: List[Callable[[Dict[str, Any]], None]] = []
+        self._vigilante: Optional[threading.Thread] = None
+        self._detener_vigilancia = threading.Event()
+        self._version = 0  # Último número publicado: nunca retrocede, ni al cambiar de archivo
+        self.usar_archivo(ruta)
+
+    def usar_archivo(self, ruta: Optional[str]) -> None:
+        """Cambia el archivo de origen (descarta cambios hechos en memoria); se leerá en el primer acceso"""
+        with self._lock:
+            self._ruta = ruta
+            self._datos: Optional[Dict[str, Any]] = None  # None = aún no se leyó
+            self._mtime: Optional[float] = None
+            self._sobrescritos: Dict[str, Any] = {}  # Cambios hechos con actualizar()
+            self._instantanea: Optional[InstantaneaConfig] = None
+            for clave in self._claves_en_cache():
+                del self.__dict__[clave]
+
+    def instantanea(self) -> InstantaneaConfig:
+        """
+        Devuelve la versión vigente; varias lecturas sobre la misma instantánea
+        son siempre coherentes entre sí aunque otro hilo actualice la configuración
+        """
+        instantanea = self._instantanea
+        if instantanea is None:
+            with self._lock:
+                instantanea = self._vigente()
+        return instantanea
+
+    def _vigente(self) -> InstantaneaConfig:
+        """Instantánea vigente, leyendo el archivo si todavía no se leyó (requiere self._lock)"""
+        if self._instantanea is None:
+            self._datos, self._mtime = self._leer_archivo()
+            self._version += 1
+            self._instantanea = InstantaneaConfig(self._version, self._combinar())
+        return self._instantanea
+
+    @property
+    def version(self) -> int:
+        """Número de versión: cambia solo cuando cambia algún valor"""
+        return self.instantanea().version
+
+    def __getattr__(self, nombre: str) -> Any:
+        """Solo se invoca si la clave no está en caché: la lee de la instantánea vigente y la memoriza"""
+        if nombre.startswith("_"):
+            raise AttributeError(nombre)
+        with self._lock:
+            # Bajo el lock de los escritores: no se memoriza un valor que ya fue reemplazado
+            instantanea = self._vigente()
+            if nombre not in vars(instantanea):
+                raise AttributeError(f"Clave de configuración desconocida: {nombre}")
+            valor = self.__dict__[nombre] = vars(instantanea)[nombre]
+        return valor
+
+    def _claves_en_cache(self) -> List[str]:
+        """Claves de configuración ya memorizadas como atributos"""
+        return [clave for clave in self.__dict__ if not clave.startswith("_")]
+
+    def __setattr__(self, nombre: str, valor: Any) -> None:
+        """Asignar una clave pública equivale a actualizar(clave=valor)"""
+        if nombre.startswith("_"):
+            object.__setattr__(self, nombre, valor)
+        else:
+            self.actualizar(**{nombre: valor})
+
+    def actualizar(self, **cambios: Any) -> int:
+        """
+        Publica una nueva instantánea con los cambios aplicados de forma atómica
+        Devuelve el número de versión resultante
+        """
+        if "version" in cambios:
+            raise ValueError("'version' es un nombre reservado")
+        with self._lock:
+            self._sobrescritos.update(cambios)
+            version, modificados = self._publicar()
+            suscriptores = list(self._suscriptores)
+        if modificados:
+            for callback in suscriptores:
+                callback(modificados)
+        return version
+
+    def _combinar(self) -> Dict[str, Any]:
+        """Valores por defecto < archivo < entorno < cambios en memoria (requiere self._lock)"""
+        valores = dict(self.VALORES_POR_DEFECTO)
+        valores.update(self._datos or {})
+        for variable, valor in os.environ.items():
+            if variable.startswith(self.PREFIJO_ENTORNO):
+                valores[variable[len(self.PREFIJO_ENTORNO):].lower()] = valor
+        valores.update(self._sobrescritos)
+        return valores
+
+    def _publicar(self) -> Tuple[int, Dict[str, Any]]:
+        """Construye y publica la nueva instantánea si algo cambió (requiere self._lock)"""
+        if self._datos is None:
+            self._datos, self._mtime = self._leer_archivo()
+        anterior = self._instantanea
+        valores = self._combinar()
+        previos = anterior.como_dict() if anterior is not None else {}
+        # Se compara la unión de claves: una clave quitada del archivo o del entorno
+        # también es un cambio, y se informa con valor None
+        ausente = object()
+        cambios = {
+            clave: valores.get(clave)
+            for clave in set(previos) | set(valores)
+            if previos.get(clave, ausente) != valores.get(clave, ausente)
+        }
+        if anterior is not None and not cambios:
+            return anterior.version, {}
+        self._version += 1
+        # Una sola asignación de referencia: los lectores ven la versión vieja o la nueva, nunca una mezcla
+        self._instantanea = InstantaneaConfig(self._version, valores)
+        for clave in self._claves_en_cache():
+            del self.__dict__[clave]  # Se vuelven a leer de la instantánea nueva
+        return self._version, cambios
+
+    def _leer_archivo(self) -> Tuple[Dict[str, Any], Optional[float]]:
+        """Lee y parsea el archivo completo; devuelve (datos, mtime)"""
+        if self._ruta is None or not os.path.exists(self._ruta):
+            return {}, None
+        mtime = os.stat(self._ruta).st_mtime
+        extension = os.path.splitext(self._ruta)[1].lower()
+        if extension == ".toml":
+            if tomllib is None:
+                raise ValueError("Leer TOML requiere Python 3.11+ (tomllib)")
+            with open(self._ruta, "rb") as archivo:
+                return tomllib.load(archivo), mtime
+        with open(self._ruta, "r", encoding="utf-8") as archivo:
+            if extension == ".json":
+                return json.load(archivo), mtime
+            # Formato .env: CLAVE=valor por línea, '#' para comentarios
+            datos: Dict[str, Any] = {}
+            for linea in archivo:
+                linea = linea.strip()
+                if linea and not linea.startswith("#") and "=" in linea:
+                    clave, valor = linea.split("=", 1)
+                    datos[clave.strip().lower()] = valor.strip()
+            return datos, mtime
+
+    def recargar_si_cambio(self) -> Dict[str, Any]:
+        """
+        Vuelve a leer el archivo solo si cambió su mtime
+        Publica una nueva instantánea y notifica a los suscriptores
+        Devuelve {clave: valor_nuevo} con las claves que cambiaron (None si se quitó)
+        """
+        with self._lock:
+            if self._ruta is None or self._instantanea is None:
+                return {}  # Nada leído todavía: el primer acceso ya tomará la versión actual
+            try:
+                mtime = os.stat(self._ruta).st_mtime
+            except OSError:
+                return {}
+            if mtime == self._mtime:
+                return {}
+            self._datos, self._mtime = self._leer_archivo()
+            _, cambios = self._publicar()
+            suscriptores = list(self._suscriptores)
+        if cambios:
+            for callback in suscriptores:
+                callback(cambios)
+        return cambios
+
+    def suscribir(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Registra una función que recibe {clave: valor_nuevo} tras cada cambio publicado"""
+        with self._lock:
+            self._suscriptores.append(callback)
+
+    def vigilar(self, intervalo: float = 1.0) -> None:
+        """Revisa el mtime del archivo en segundo plano cada `intervalo` segundos"""
+        if self._vigilante is not None:
+            return
+        self._detener_vigilancia.clear()
+
+        def bucle() -> None:
+            while not self._detener_vigilancia.wait(intervalo):
+                self.recargar_si_cambio()
+
+        self._vigilante = threading.Thread(target=bucle, name="Configuracion-Vigilante", daemon=True)
+        self._vigilante.start()
+
+    def detener_vigilancia(self) -> None:
+        """Detiene el hilo vigilante"""
+        if self._vigilante is not None:
+            self._detener_vigilancia.set()
+            self._vigilante.join()
+            self._vigilante = None
     
+    def liberar(self) -> None:
+        """Gancho de SingletonMeta.restablecer(): detiene el hilo vigilante"""
+        self.detener_vigilancia()
+
     def mostrar_configuracion(self) -> None:
         """Imprime los valores actuales de la configuración"""
         print(f"Configuración Actual -> Idioma: {self.idioma} | Zona Horaria: {self.zona_horaria}")
@@ -45,4 +279,35 @@ if __name__ == "__main__":
     if es_mismo_objeto:
         print("ÉXITO: El patrón Singleton funciona correctamente")
     else:
-        print("ERROR: Se crearon instancias diferentes")
\ No newline at end of file
+        print("ERROR: Se crearon instancias diferentes")
+
+    # Carga perezosa desde archivo con recarga por mtime
+    print("\n--- Configuración desde archivo JSON ---")
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "config.json")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"idioma": "PT", "zona_horaria": "UTC-3", "max_usuarios": 50}, archivo)
+
+        config_admin.usar_archivo(ruta)
+        config_admin.suscribir(lambda cambios: print(f"[Suscriptor] Claves cambiadas: {cambios}"))
+        config_usuario.mostrar_configuracion()  # Primer acceso: se lee el archivo
+
+        inicio = time.perf_counter()
+        for _ in range(100_000):
+            config_usuario.max_usuarios  # Se lee de la instantánea: no se relee ni se parsea
+        print(f"100000 lecturas de max_usuarios: {time.perf_counter() - inicio:.4f}s")
+
+        # Modificamos el archivo (forzando un mtime distinto) y recargamos
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"idioma": "PT", "zona_horaria": "UTC-3", "max_usuarios": 80}, archivo)
+        os.utime(ruta, (time.time() + 1, time.time() + 1))
+        config_admin.recargar_si_cambio()
+        print(f"max_usuarios tras recargar: {config_usuario.max_usuarios}")
+
+    # Instantáneas inmutables: lecturas coherentes mientras otro hilo escribe
+    print("\n--- Instantáneas copy-on-write ---")
+    foto = config_usuario.instantanea()
+    version = config_admin.actualizar(idioma="EN", zona_horaria="UTC+12")
+    print(f"Instantánea previa (v{foto.version}): {foto.idioma} / {foto.zona_horaria}")
+    actual = config_usuario.instantanea()
+    print(f"Instantánea actual (v{version}): {actual.idioma} / {actual.zona_horaria}")
@@ -0,0 +1,100 @@
+"""
+Pruebas de recarga de Configuracion (al estilo de eje03 y eje05).
+Valida que quitar una clave del archivo y recargarlo publica una versión
+nueva sin esa clave y avisa a los suscriptores con valor None.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from main import Configuracion
+
+
+# ============================================================================
+# Pruebas de Recarga
+# ============================================================================
+
+
+class PruebasConfiguracion:
+    """Suite de pruebas para validar la recarga del archivo de configuración."""
+
+    def __init__(self) -> None:
+        self.config = Configuracion()
+        self.resultados: List[str] = []
+
+    def agregar_resultado(self, msg: str) -> None:
+        """Agrega un resultado a la lista."""
+        self.resultados.append(msg)
+        print(msg)
+
+    def prueba_quitar_clave(self) -> bool:
+        """
+        Prueba 1: si la recarga solo quita una clave, se publica una versión
+        nueva que ya no la tiene y los suscriptores reciben {clave: None}.
+        """
+        print("\n" + "=" * 70)
+        print("PRUEBA 1: QUITAR UNA CLAVE DEL ARCHIVO Y RECARGAR")
+        print("=" * 70)
+
+        avisos: List[Dict[str, Any]] = []
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "config.json")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump({"idioma": "PT", "max_usuarios": 50}, archivo)
+            self.config.usar_archivo(ruta)
+            self.config.suscribir(avisos.append)
+            version_previa = self.config.version
+            tenia_clave = self.config.max_usuarios == 50
+
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump({"idioma": "PT"}, archivo)
+            os.utime(ruta, (time.time() + 1, time.time() + 1))  # Fuerza un mtime distinto
+            cambios = self.config.recargar_si_cambio()
+
+        foto = self.config.instantanea()
+        sin_clave = "max_usuarios" not in foto.como_dict() and not hasattr(self.config, "max_usuarios")
+        resultado = (tenia_clave and sin_clave and foto.version > version_previa
+                     and cambios == {"max_usuarios": None} and avisos == [cambios])
+
+        self.agregar_resultado(f"Cambios informados: {cambios} | avisos: {avisos}")
+        self.agregar_resultado(f"Versión: {version_previa} -> {foto.version} | clave ausente: {sin_clave}")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
+    def ejecutar_todas(self) -> None:
+        """Ejecuta todas las pruebas y genera reporte final."""
+        resultados_pruebas: List[Tuple[str, bool]] = []
+        resultados_pruebas.append(("Quitar Clave", self.prueba_quitar_clave()))
+
+        # Reporte final
+        print("\n" + "=" * 70)
+        print("REPORTE FINAL")
+        print("=" * 70)
+        total = len(resultados_pruebas)
+        exitosas = sum(1 for _, result in resultados_pruebas if result)
+        for nombre, resultado in resultados_pruebas:
+            estado = "✓ EXITOSA" if resultado else "✗ FALLIDA"
+            print(f"{nombre:.<40} {estado}")
+
+        print("-" * 70)
+        print(f"Resultado: {exitosas}/{total} pruebas exitosas")
+        if exitosas == total:
+            print("✓ TODAS LAS PRUEBAS EXITOSAS")
+        else:
+            print(f"✗ {total - exitosas} prueba(s) fallida(s)")
+        print("=" * 70)
+
+
+# ============================================================================
+# Ejecucion principal
+# ============================================================================
+
+
+if __name__ == "__main__":
+    pruebas = PruebasConfiguracion()
+    pruebas.ejecutar_todas()
@@ -1,42 +1,432 @@
 import sys
 import os
+import atexit
 import datetime
+import gzip
+import queue
+import re
+import shutil
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from patrones import SingletonMeta
 
+class _ColaEscritor(queue.Queue):
+    """Cola del modo asíncrono que además indica cuándo terminó su hilo escritor"""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.terminado = threading.Event()
+
+
 class Logger(metaclass=SingletonMeta):
     """
     Sistema de Log centralizado
     Escribe mensajes en un archivo de texto con marca de tiempo
+    Modos: 'directo' (abre y cierra el archivo por mensaje), 'buffer'
+    (archivo persistente con vaciado por tamaño y por tiempo) o 'asincrono'
+    (log() solo encola; un hilo escritor vacía la cola por lotes)
     """
+
+    MODOS = ("directo", "buffer", "asincrono")
+    POLITICAS = ("bloquear", "descartar_antiguo", "descartar_nuevo")
     
-    def __init__(self):
+    def __init__(self, modo: str = "directo", max_buffer: int = 64 * 1024,
+                 intervalo_flush: float = 1.0, eco_consola: bool = True,
+                 max_cola: int = 10_000, politica: str = "bloquear", tam_lote: int = 512):
         # Definimos el nombre del archivo de log
         self.nombre_archivo = "bitacora.log"
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._bytes_buffer = 0
+        self._archivo: Optional[TextIO] = None
+        self._ultimo_flush = time.monotonic()
+        # (segundo, texto) en una sola referencia para leerla sin lock
+        self._cache_timestamp: Tuple[int, str] = (-1, "")
+        # Estado del modo asíncrono
+        self._cola: Optional[_ColaEscritor] = None
+        self._escritor: Optional[threading.Thread] = None
+        # Hilo que vacía el buffer al vencer intervalo_flush aunque no lleguen más log()
+        self._vaciador: Optional[threading.Thread] = None
+        self._parar_vaciador = threading.Event()
+        self._lock_contadores = threading.Lock()
+        self.descartados_antiguos = 0
+        self.descartados_nuevos = 0
+        # Estado de la rotación (desactivada por defecto)
+        self.max_bytes_archivo = 0
+        self.intervalo_rotacion = 0.0
+        self.copias = 5
+        self._bytes_archivo = self._tamano_actual()
+        self._inicio_segmento = time.time()
+        self._indice_segmento: Optional[int] = None
+        self._cola_compresion: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._compresor: Optional[threading.Thread] = None
+        self.configurar(modo, max_buffer, intervalo_flush, eco_consola, max_cola, politica, tam_lote)
+        # Garantiza que nada quede en memoria al terminar el programa
+        atexit.register(self.close)
+
+    def configurar(self, modo: str = "directo", max_buffer: int = 64 * 1024,
+                   intervalo_flush: float = 1.0, eco_consola: bool = True,
+                   max_cola: int = 10_000, politica: str = "bloquear", tam_lote: int = 512) -> None:
+        """
+        Cambia el modo de escritura. Vacía lo pendiente antes de cambiar
+        max_buffer: bytes acumulados que fuerzan un vaciado
+        intervalo_flush: segundos máximos que un mensaje espera en memoria
+        max_cola / politica / tam_lote: capacidad de la cola asíncrona, qué hacer
+        cuando está llena y cuántos registros escribe el hilo por lote
+        """
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de log desconocido: {modo!r} (use uno de {self.MODOS})")
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política desconocida: {politica!r} (use una de {self.POLITICAS})")
+        self._detener_escritor()
+        self._detener_vaciador()
+        self.flush()
+        self.modo = modo
+        self.max_buffer = max_buffer
+        self.intervalo_flush = intervalo_flush
+        self.eco_consola = eco_consola
+        self.politica = politica
+        self.tam_lote = tam_lote
+        if modo == "asincrono":
+            self._cola = _ColaEscritor(max_cola)
+            self._escritor = threading.Thread(target=self._bucle_escritor, args=(self._cola,),
+                                              name="Logger-Escritor", daemon=True)
+            self._escritor.start()
+        elif modo == "buffer":
+            self._parar_vaciador = threading.Event()
+            self._vaciador = threading.Thread(target=self._bucle_vaciador, args=(self._parar_vaciador,),
+                                              name="Logger-Vaciador", daemon=True)
+            self._vaciador.start()
+
+    def configurar_rotacion(self, max_bytes: int = 0, intervalo: float = 0.0, copias: int = 5) -> None:
+        """
+        Activa la rotación de bitacora.log
+        max_bytes: tamaño que dispara la rotación (0 = sin límite)
+        intervalo: segundos de vida de cada segmento (0 = sin límite)
+        copias: segmentos comprimidos (.gz) que se conservan
+        """
+        if max_bytes < 0 or intervalo < 0 or copias < 1:
+            raise ValueError("max_bytes e intervalo deben ser >= 0 y copias >= 1")
+        with self._lock:
+            self.max_bytes_archivo = max_bytes
+            self.intervalo_rotacion = intervalo
+            self.copias = copias
+            self._inicio_segmento = time.time()
+
+    def _timestamp(self) -> str:
+        """Formatea la hora actual, reutilizando el texto dentro del mismo segundo"""
+        segundo = int(time.time())
+        cache = self._cache_timestamp
+        if cache[0] != segundo:
+            texto = datetime.datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+            cache = (segundo, texto)
+            self._cache_timestamp = cache
+        return cache[1]
     
     def log(self, mensaje: str) -> None:
         """
         Registra un mensaje en el archivo de log
         Formato: [YYYY-MM-DD HH:MM:SS] Mensaje
         """
-        # Obtenemos fecha y hora actual
-        ahora = datetime.datetime.now()
-        timestamp = ahora.strftime("%Y-%m-%d %H:%M:%S")
-        
         # Preparamos la línea a escribir
-        entrada_log = f"[{timestamp}] {mensaje}\n"
+        entrada_log = f"[{self._timestamp()}] {mensaje}\n"
+
+        if self.modo == "asincrono" and self._encolar(entrada_log):
+            if self.eco_consola:
+                print(f"[Consola] Log registrado: {mensaje}")
+            return
+
+        # Si el escritor asíncrono se está deteniendo, el registro va al buffer
+        if self.modo in ("buffer", "asincrono"):
+            with self._lock:
+                self._buffer.append(entrada_log)
+                self._bytes_buffer += len(entrada_log)
+                vencido = time.monotonic() - self._ultimo_flush >= self.intervalo_flush
+                if self._bytes_buffer >= self.max_buffer or vencido:
+                    self._vaciar_buffer()
+            if self.eco_consola:
+                print(f"[Consola] Log registrado: {mensaje}")
+            return
         
         # Abrimos en modo 'append' (a) para no sobrescribir el historial
         # Usamos 'utf-8' para soportar tildes y caracteres especiales
         try:
-            with open(self.nombre_archivo, "a", encoding="utf-8") as archivo:
-                archivo.write(entrada_log)
-            print(f"[Consola] Log registrado: {mensaje}")
+            with self._lock:
+                self._escribir(entrada_log, persistente=False)
+            if self.eco_consola:
+                print(f"[Consola] Log registrado: {mensaje}")
         except IOError as e:
             print(f"Error crítico escribiendo en log: {e}")
 
+    def _encolar(self, entrada: str) -> bool:
+        """
+        Encola un registro aplicando la política de contrapresión.
+        Devuelve False si ya no hay escritor (la cola se cerró) y no se encoló
+        """
+        cola = self._cola
+        if cola is None:
+            return False
+        self._poner(cola, entrada)
+        if cola.terminado.is_set():
+            # El escritor terminó mientras encolábamos: lo que quede en la
+            # cola (incluido este registro) pasa al buffer para no perderlo
+            self._recuperar_pendientes(cola)
+        return True
+
+    def _poner(self, cola: _ColaEscritor, entrada: str) -> None:
+        if self.politica == "bloquear":
+            cola.put(entrada)
+            return
+        while True:
+            try:
+                cola.put_nowait(entrada)
+                return
+            except queue.Full:
+                if self.politica == "descartar_nuevo":
+                    with self._lock_contadores:
+                        self.descartados_nuevos += 1
+                    return
+            # descartar_antiguo: libera un hueco sacando el registro más viejo
+            try:
+                antiguo = cola.get_nowait()
+            except queue.Empty:
+                continue
+            if antiguo is None:
+                # Es la marca de fin del escritor: se devuelve y se descarta el nuevo
+                cola.put(None)
+                with self._lock_contadores:
+                    self.descartados_nuevos += 1
+                return
+            with self._lock_contadores:
+                self.descartados_antiguos += 1
+
+    def _recuperar_pendientes(self, cola: _ColaEscritor) -> None:
+        """Pasa al buffer los registros que quedaron en una cola ya sin escritor"""
+        with self._lock:
+            while True:
+                try:
+                    entrada = cola.get_nowait()
+                except queue.Empty:
+                    break
+                if entrada is not None:
+                    self._buffer.append(entrada)
+                    self._bytes_buffer += len(entrada)
+
+    def _bucle_escritor(self, cola: _ColaEscritor) -> None:
+        """Hilo escritor: drena la cola por lotes hasta encontrar la marca de fin (None)"""
+        fin = False
+        while not fin:
+            lote = [cola.get()]
+            while len(lote) < self.tam_lote and lote[-1] is not None:
+                try:
+                    lote.append(cola.get_nowait())
+                except queue.Empty:
+                    break
+            fin = lote[-1] is None
+            with self._lock:
+                self._buffer.extend(e for e in lote if e is not None)
+                self._vaciar_buffer()
+
+    def _detener_escritor(self) -> None:
+        """
+        Detiene el hilo escritor: primero deja de aceptar registros (los nuevos
+        log() van al buffer), luego encola la marca de fin y el hilo escribe solo
+        lo que estaba delante de ella. Termina aunque otros hilos sigan registrando
+        """
+        escritor, cola = self._escritor, self._cola
+        if escritor is None:
+            return
+        self._cola = None
+        cola.put(None)  # Si la cola está llena espera: el escritor la sigue vaciando
+        escritor.join()
+        self._escritor = None
+        # Registros de log() que tomaron la cola justo antes de que se cerrara:
+        # los que lleguen después de marcar `terminado` los recupera su propio log()
+        cola.terminado.set()
+        self._recuperar_pendientes(cola)
+
+    def _bucle_vaciador(self, parar: threading.Event) -> None:
+        """Vacía el buffer cuando su registro más viejo cumple intervalo_flush"""
+        espera = self.intervalo_flush
+        while not parar.wait(espera):
+            with self._lock:
+                restante = self._ultimo_flush + self.intervalo_flush - time.monotonic()
+                if restante <= 0:
+                    if self._buffer:
+                        self._vaciar_buffer()
+                    restante = self.intervalo_flush
+            espera = restante
+
+    def _detener_vaciador(self) -> None:
+        if self._vaciador is None:
+            return
+        self._parar_vaciador.set()
+        self._vaciador.join()
+        self._vaciador = None
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Registros pendientes en la cola y descartados por la política"""
+        return {
+            "pendientes": self._cola.qsize() if self._cola is not None else 0,
+            "descartados_antiguos": self.descartados_antiguos,
+            "descartados_nuevos": self.descartados_nuevos,
+        }
+
+    def _vaciar_buffer(self) -> None:
+        """Escribe el buffer en el archivo persistente (requiere self._lock)"""
+        self._ultimo_flush = time.monotonic()
+        if not self._buffer:
+            return
+        try:
+            self._escribir("".join(self._buffer), persistente=True)
+        except IOError as e:
+            print(f"Error crítico escribiendo en log: {e}")
+        self._buffer.clear()
+        self._bytes_buffer = 0
+
+    def _escribir(self, texto: str, persistente: bool) -> None:
+        """Escribe en bitacora.log rotando antes si corresponde (requiere self._lock)"""
+        tamano = len(texto.encode("utf-8"))
+        if self._debe_rotar(tamano):
+            self._rotar()
+        if persistente:
+            if self._archivo is None:
+                self._archivo = open(self.nombre_archivo, "a", encoding="utf-8")
+            self._archivo.write(texto)
+            self._archivo.flush()
+        else:
+            with open(self.nombre_archivo, "a", encoding="utf-8") as archivo:
+                archivo.write(texto)
+        self._bytes_archivo += tamano
+
+    # ------------------------------------------------------------------
+    # Rotación y compresión de segmentos
+    # ------------------------------------------------------------------
+
+    def _tamano_actual(self) -> int:
+        """Tamaño en bytes de bitacora.log (0 si no existe)"""
+        try:
+            return os.path.getsize(self.nombre_archivo)
+        except OSError:
+            return 0
+
+    def _debe_rotar(self, tamano_nuevo: int) -> bool:
+        """Indica si el segmento actual superó su tamaño o su tiempo de vida"""
+        if self._bytes_archivo == 0:
+            return False
+        if self.max_bytes_archivo and self._bytes_archivo + tamano_nuevo > self.max_bytes_archivo:
+            return True
+        return bool(self.intervalo_rotacion) and time.time() - self._inicio_segmento >= self.intervalo_rotacion
+
+    def _segmentos(self) -> List[Tuple[int, str]]:
+        """Segmentos rotados como (índice, ruta), del más antiguo al más reciente"""
+        directorio = os.path.dirname(os.path.abspath(self.nombre_archivo))
+        patron = re.compile(re.escape(os.path.basename(self.nombre_archivo)) + r"\.(\d+)(\.gz)?$")
+        encontrados: Dict[int, str] = {}
+        for nombre in os.listdir(directorio):
+            coincidencia = patron.match(nombre)
+            if coincidencia:
+                indice = int(coincidencia.group(1))
+                # Si conviven el segmento crudo y su .gz, el .gz ya está completo
+                if indice not in encontrados or coincidencia.group(2):
+                    encontrados[indice] = os.path.join(directorio, nombre)
+        return sorted(encontrados.items())
+
+    def _rotar(self) -> None:
+        """Renombra el segmento actual y delega su compresión (requiere self._lock)"""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        if self._indice_segmento is None:
+            segmentos = self._segmentos()
+            self._indice_segmento = segmentos[-1][0] if segmentos else 0
+        self._indice_segmento += 1
+        destino = f"{self.nombre_archivo}.{self._indice_segmento:06d}"
+        os.replace(self.nombre_archivo, destino)
+        self._bytes_archivo = 0
+        self._inicio_segmento = time.time()
+        # La compresión ocurre en segundo plano para no frenar a quien llama a log()
+        if self._compresor is None:
+            self._compresor = threading.Thread(target=self._bucle_compresor, name="Logger-Compresor", daemon=True)
+            self._compresor.start()
+        self._cola_compresion.put(destino)
+
+    def _bucle_compresor(self) -> None:
+        """Hilo compresor: gzip de cada segmento rotado y limpieza de los antiguos"""
+        while True:
+            ruta = self._cola_compresion.get()
+            if ruta is None:
+                return
+            try:
+                with open(ruta, "rb") as origen, gzip.open(ruta + ".gz.tmp", "wb") as destino:
+                    shutil.copyfileobj(origen, destino)
+                os.replace(ruta + ".gz.tmp", ruta + ".gz")
+                os.remove(ruta)
+                for _, antiguo in self._segmentos()[:-self.copias]:
+                    os.remove(antiguo)
+            except OSError as e:
+                print(f"Error comprimiendo segmento de log {ruta}: {e}")
+
+    def _detener_compresor(self) -> None:
+        """Espera a que terminen las compresiones pendientes"""
+        if self._compresor is None:
+            return
+        self._cola_compresion.put(None)
+        self._compresor.join()
+        self._compresor = None
+
+    def leer_registros(self) -> Iterator[str]:
+        """
+        Genera las líneas de log, de la más antigua a la más reciente, recorriendo
+        los segmentos rotados (comprimidos o no) y luego bitacora.log
+        Lee línea a línea, sin cargar archivos completos en memoria
+        """
+        self.flush()
+        for _, ruta in self._segmentos():
+            # Un segmento crudo puede comprimirse mientras lo buscamos
+            for candidata in (ruta, ruta + ".gz"):
+                try:
+                    abrir = gzip.open if candidata.endswith(".gz") else open
+                    with abrir(candidata, "rt", encoding="utf-8") as archivo:
+                        for linea in archivo:
+                            yield linea.rstrip("\n")
+                    break
+                except FileNotFoundError:
+                    continue
+        try:
+            with open(self.nombre_archivo, "r", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    yield linea.rstrip("\n")
+        except FileNotFoundError:
+            return
+
+    def flush(self) -> None:
+        """Fuerza la escritura de los mensajes pendientes"""
+        with self._lock:
+            self._vaciar_buffer()
+
+    def close(self) -> None:
+        """Drena la cola asíncrona, vacía lo pendiente, libera el archivo y espera las compresiones"""
+        self._detener_escritor()
+        self._detener_vaciador()
+        if self.modo == "asincrono":
+            self.modo = "buffer"  # Sin hilo escritor, lo que llegue va al buffer
+        with self._lock:
+            self._vaciar_buffer()
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+        self._detener_compresor()
+
+    def liberar(self) -> None:
+        """Gancho de SingletonMeta.restablecer(): cierra el archivo y deja de esperar el atexit"""
+        self.close()
+        atexit.unregister(self.close)
+
 # --- Bloque de Prueba ---
 if __name__ == "__main__":
     print("--- Ejercicio 02: Logger Centralizado ---")
@@ -55,5 +445,47 @@ if __name__ == "__main__":
         print("ÉXITO: Ambos loggers son la misma instancia.")
     else:
         print("ERROR: Instancias duplicadas detectadas.")
+
+    # Modo con buffer: muchos hilos comparten el archivo persistente
+    print(f"\nModo buffer: 8 hilos x 1000 mensajes...")
+    logger_sistema.configurar("buffer", eco_consola=False)
+    hilos = [
+        threading.Thread(target=lambda n=n: [logger_sistema.log(f"Hilo {n} evento {i}") for i in range(1000)])
+        for n in range(8)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    logger_sistema.close()
+    print(f"8000 mensajes registrados en {time.perf_counter() - inicio:.4f}s")
+
+    # Modo asíncrono: log() solo encola, el hilo escritor toca el disco
+    print(f"\nModo asíncrono (cola de 1000, descartar_antiguo): 8 hilos x 1000 mensajes...")
+    logger_sistema.configurar("asincrono", eco_consola=False, max_cola=1000, politica="descartar_antiguo")
+    hilos = [
+        threading.Thread(target=lambda n=n: [logger_sistema.log(f"Hilo {n} asincrono {i}") for i in range(1000)])
+        for n in range(8)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    print(f"8000 mensajes encolados en {time.perf_counter() - inicio:.4f}s")
+    logger_sistema.close()
+    print(f"Estadísticas tras drenar la cola: {logger_sistema.estadisticas()}")
+
+    # Rotación por tamaño: segmentos de 64 KB comprimidos en segundo plano
+    print(f"\nRotación cada 64 KB conservando 3 copias comprimidas...")
+    logger_sistema.configurar("buffer", eco_consola=False, max_buffer=8 * 1024)
+    logger_sistema.configurar_rotacion(max_bytes=64 * 1024, copias=3)
+    for i in range(5000):
+        logger_sistema.log(f"Evento rotado {i}")
+    logger_sistema.close()
+    total = sum(1 for _ in logger_sistema.leer_registros())
+    print(f"Segmentos: {[os.path.basename(r) for _, r in logger_sistema._segmentos()]}")
+    print(f"Registros legibles (segmentos + archivo actual): {total}")
         
-    print(f"\nRevisa el archivo '{logger_sistema.nombre_archivo}' para ver los resultados.")
\ No newline at end of file
+    print(f"\nRevisa el archivo '{logger_sistema.nombre_archivo}' para ver los resultados.")
@@ -0,0 +1,160 @@
+"""
+Variante asyncio de ConexionBD.
+Reemplaza time.sleep por await asyncio.sleep para no bloquear el bucle de
+eventos, deduplica la conexión inicial entre corrutinas concurrentes y
+multiplexa miles de sesiones lógicas sobre unas pocas conexiones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from patrones import SingletonMeta
+
+
+class ConexionAsync:
+    """Conexión física simulada con la latencia de red de ConexionBD"""
+
+    def __init__(self, numero: int, latencia_consulta: float) -> None:
+        self.numero = numero
+        self.latencia_consulta = latencia_consulta
+        self.consultas = 0
+
+    async def ejecutar(self, consulta: str) -> str:
+        """Ejecuta una consulta simulada sin bloquear el bucle"""
+        await asyncio.sleep(self.latencia_consulta)
+        self.consultas += 1
+        return f"resultado({consulta})"
+
+
+class ConexionBDAsync(metaclass=SingletonMeta):
+    """
+    Singleton asíncrono de conexión a Base de Datos
+    La instancia es única por proceso; la conexión se abre una sola vez aunque
+    muchas corrutinas llamen a conectar() al mismo tiempo
+    La cola de conexiones y la tarea de conexión pertenecen a un bucle de eventos:
+    si se usa desde otro bucle (p. ej. un segundo asyncio.run()), ese estado se
+    descarta y se vuelve a conectar. Se usa desde un bucle a la vez
+    """
+
+    def __init__(self, num_conexiones: int = 4, latencia_consulta: float = 0.05) -> None:
+        self.host: str = "192.168.1.10"
+        self.puerto: int = 5432
+        self.num_conexiones = num_conexiones
+        self.latencia_consulta = latencia_consulta
+        self._bucle: Optional[asyncio.AbstractEventLoop] = None  # Bucle dueño del estado
+        self._conectado: bool = False
+        self._conexion_en_curso: Optional[asyncio.Task] = None
+        self._libres: Optional[asyncio.Queue] = None
+        self.conexiones_realizadas = 0
+
+    async def conectar(self) -> None:
+        """
+        Establece la conexión si no está activa
+        Las corrutinas que llegan mientras hay una conexión en curso esperan
+        esa misma tarea en lugar de abrir otra
+        """
+        self._adoptar_bucle()
+        if self._conectado:
+            return
+        if self._conexion_en_curso is None:
+            self._conexion_en_curso = asyncio.ensure_future(self._abrir())
+        try:
+            # shield: si un llamador se cancela, la conexión sigue para los demás
+            await asyncio.shield(self._conexion_en_curso)
+        finally:
+            if self._conexion_en_curso is not None and self._conexion_en_curso.done():
+                self._conexion_en_curso = None
+
+    def _adoptar_bucle(self) -> None:
+        """Descarta la cola y la tarea de conexión si pertenecen a otro bucle de eventos"""
+        bucle = asyncio.get_running_loop()
+        if bucle is not self._bucle:
+            self._bucle = bucle
+            self._conectado = False
+            self._conexion_en_curso = None
+            self._libres = None
+
+    async def _abrir(self) -> None:
+        """Abre las conexiones físicas pagando una única latencia de red"""
+        print(f"[BD] Iniciando conexión a {self.host}:{self.puerto}...")
+        await asyncio.sleep(1)  # Simulamos latencia de red
+        libres: asyncio.Queue = asyncio.Queue()
+        for numero in range(self.num_conexiones):
+            libres.put_nowait(ConexionAsync(numero, self.latencia_consulta))
+        self._libres = libres
+        self._conectado = True
+        self.conexiones_realizadas += 1
+        print(f"[BD] Conexión establecida exitosamente ({self.num_conexiones} conexiones)")
+
+    async def desconectar(self) -> None:
+        """Cierra la conexión si está activa"""
+        self._adoptar_bucle()
+        if self._conexion_en_curso is not None:
+            await asyncio.shield(self._conexion_en_curso)
+        if not self._conectado:
+            print("[BD Error] No se puede desconectar: No hay sesión activa")
+            return
+        print("[BD] Cerrando sesión...")
+        self._conectado = False
+        self._libres = None
+        await asyncio.sleep(0.5)
+        print("[BD] Desconectado correctamente")
+
+    @asynccontextmanager
+    async def sesion(self) -> AsyncIterator[ConexionAsync]:
+        """
+        Sesión lógica: `async with bd.sesion() as conexion:`
+        Conecta de forma perezosa y presta una de las conexiones físicas
+        """
+        await self.conectar()
+        libres = self._libres
+        conexion = await libres.get()
+        try:
+            yield conexion
+        finally:
+            libres.put_nowait(conexion)
+
+    def estado(self) -> None:
+        """Imprime el estado actual de la conexión"""
+        status = "ONLINE" if self._conectado else "OFFLINE"
+        print(f"Estado del Sistema: {status}")
+
+
+# --- Bloque de Prueba ---
+async def _demostracion(num_sesiones: int = 5000) -> None:
+    bd = ConexionBDAsync()
+
+    print("--- Conexión concurrente: 100 corrutinas llaman a conectar() ---")
+    await asyncio.gather(*(bd.conectar() for _ in range(100)))
+    print(f"Conexiones físicas abiertas: {bd.conexiones_realizadas} (esperado: 1)")
+    bd.estado()
+
+    print(f"\n--- {num_sesiones} sesiones lógicas sobre {bd.num_conexiones} conexiones ---")
+
+    async def consulta(n: int) -> str:
+        async with bd.sesion() as conexion:
+            return await conexion.ejecutar(f"SELECT * FROM pedidos WHERE id = {n}")
+
+    inicio = time.perf_counter()
+    resultados: List[str] = await asyncio.gather(*(consulta(n) for n in range(num_sesiones)))
+    duracion = time.perf_counter() - inicio
+    print(f"{len(resultados)} consultas en {duracion:.2f}s ({len(resultados) / duracion:.0f} consultas/s)")
+
+    await bd.desconectar()
+    bd.estado()
+
+
+if __name__ == "__main__":
+    print("--- Ejercicio 03: Singleton Asíncrono en Base de Datos ---")
+    a = ConexionBDAsync(num_conexiones=8, latencia_consulta=0.01)
+    b = ConexionBDAsync()
+    print(f"¿Misma instancia? {a is b}\n")
+    asyncio.run(_demostracion())
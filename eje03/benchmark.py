@@ -0,0 +1,62 @@
+"""
+Benchmark del pool de ConexionBD.
+Mide el rendimiento (consultas/s) de muchos hilos compartiendo 1 conexión
+frente a N conexiones, usando la latencia simulada de ConexionSimulada.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List
+
+from pool import ConexionSimulada, PoolConexiones
+
+
+def medir_pool(num_conexiones: int, num_hilos: int = 16, consultas_por_hilo: int = 20,
+               latencia_consulta: float = 0.01) -> Dict[str, float]:
+    """Ejecuta la carga sobre un pool ya caliente y devuelve sus métricas"""
+    pool = PoolConexiones(
+        lambda: ConexionSimulada("192.168.1.10", 5432, latencia_consulta=latencia_consulta, latencia_cierre=0.0),
+        min_tam=num_conexiones,
+        max_tam=num_conexiones,
+        timeout_adquisicion=60.0,
+    )
+    # Calentamiento fuera de la medición: la latencia de conexión (1 s) se paga una vez
+    prestadas = [pool.adquirir() for _ in range(num_conexiones)]
+    for conexion in prestadas:
+        pool.liberar(conexion)
+
+    max_esperando = 0
+
+    def tarea() -> None:
+        nonlocal max_esperando
+        for i in range(consultas_por_hilo):
+            with pool.conexion() as conexion:
+                conexion.ejecutar(f"SELECT {i}")
+            max_esperando = max(max_esperando, pool.estadisticas()["esperando"])
+
+    hilos: List[threading.Thread] = [threading.Thread(target=tarea) for _ in range(num_hilos)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    estadisticas = pool.estadisticas()
+    pool.cerrar()
+    return {
+        "consultas_s": num_hilos * consultas_por_hilo / duracion,
+        "latencia_media_ms": estadisticas["latencia_media_ms"],
+        "max_esperando": max_esperando,
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("POOL DE CONEXIONES: 16 HILOS x 20 CONSULTAS DE 10 ms")
+    print("=" * 70)
+    for num_conexiones in (1, 2, 4, 8, 16):
+        r = medir_pool(num_conexiones)
+        print(f"Conexiones {num_conexiones:>2} | {r['consultas_s']:8.1f} consultas/s | "
+              f"espera media {r['latencia_media_ms']:7.2f} ms | máx. esperando {r['max_esperando']:>2}")
@@ -0,0 +1,175 @@
+"""
+Cache de resultados de consultas para ConexionBD.
+Combina desalojo LRU, expiración por TTL y un tope de bytes, permite invalidar
+por prefijo de clave y agrupa los fallos concurrentes sobre una misma clave en
+una única llamada al backend.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Vuelo:
+    """Cálculo en curso de una clave; los demás hilos esperan su resultado"""
+    __slots__ = ("evento", "valor", "error", "invalidado")
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.valor: Any = None
+        self.error: Optional[BaseException] = None
+        self.invalidado = False  # Se invalidó durante el cálculo: el resultado no se guarda
+
+
+class CacheResultados:
+    """
+    Cache LRU + TTL acotada por número de entradas y por bytes
+    Cualquier objeto con obtener_o_calcular(), invalidar_prefijo() y
+    estadisticas() puede reemplazarla en ConexionBD
+    """
+
+    def __init__(self, max_entradas: int = 1024, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None,
+                 medir: Callable[[Any], int] = sys.getsizeof) -> None:
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.medir = medir  # Tamaño aproximado de cada resultado
+        self._lock = threading.Lock()
+        # clave -> (valor, instante de expiración, bytes)
+        self._entradas: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._en_vuelo: Dict[str, _Vuelo] = {}
+        self._bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self.coalescidos = 0
+
+    def _buscar(self, clave: str) -> Tuple[bool, Any]:
+        """Busca una clave vigente y la marca como la más reciente (requiere self._lock)"""
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            return False, None
+        valor, expira, tamano = entrada
+        if expira < time.monotonic():
+            del self._entradas[clave]
+            self._bytes -= tamano
+            self.expirados += 1
+            return False, None
+        self._entradas.move_to_end(clave)
+        return True, valor
+
+    def obtener(self, clave: str) -> Tuple[bool, Any]:
+        """Devuelve (encontrado, valor) sin consultar al backend"""
+        with self._lock:
+            encontrado, valor = self._buscar(clave)
+            if encontrado:
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+            return encontrado, valor
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        """Guarda un resultado y desaloja los menos usados si se superan los topes"""
+        tamano = self.medir(valor)
+        with self._lock:
+            self._guardar(clave, valor, tamano)
+
+    def _guardar(self, clave: str, valor: Any, tamano: int) -> None:
+        """Cuerpo de guardar() (requiere self._lock)"""
+        expira = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self._bytes -= anterior[2]
+        if self.max_bytes is not None and tamano > self.max_bytes:
+            return  # Nunca cabría: no se guarda
+        self._entradas[clave] = (valor, expira, tamano)
+        self._bytes += tamano
+        while len(self._entradas) > self.max_entradas or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, _, liberados) = self._entradas.popitem(last=False)
+            self._bytes -= liberados
+            self.desalojos += 1
+
+    def obtener_o_calcular(self, clave: str, calcular: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor en cache o lo calcula una sola vez
+        Si varios hilos fallan a la vez sobre la misma clave, solo el primero
+        llama a `calcular`; el resto espera y recibe el mismo resultado
+        """
+        with self._lock:
+            encontrado, valor = self._buscar(clave)
+            if encontrado:
+                self.aciertos += 1
+                return valor
+            vuelo = self._en_vuelo.get(clave)
+            if vuelo is None:
+                self.fallos += 1
+                vuelo = _Vuelo()
+                self._en_vuelo[clave] = vuelo
+                lider = True
+            else:
+                self.coalescidos += 1
+                lider = False
+        if not lider:
+            vuelo.evento.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.valor
+        tamano = 0
+        try:
+            vuelo.valor = calcular()
+            tamano = self.medir(vuelo.valor)
+        except BaseException as error:
+            vuelo.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+                # Si se invalidó mientras se calculaba, el valor puede ser previo a la
+                # invalidación: se entrega a quienes esperaban pero no se guarda
+                if vuelo.error is None and not vuelo.invalidado:
+                    self._guardar(clave, vuelo.valor, tamano)
+            vuelo.evento.set()
+        return vuelo.valor
+
+    def invalidar_prefijo(self, prefijo: str) -> int:
+        """
+        Elimina todas las claves que empiezan con `prefijo` y devuelve cuántas
+        Los cálculos en curso de esas claves no guardarán su resultado
+        """
+        with self._lock:
+            for clave, vuelo in self._en_vuelo.items():
+                if clave.startswith(prefijo):
+                    vuelo.invalidado = True
+            claves = [clave for clave in self._entradas if clave.startswith(prefijo)]
+            for clave in claves:
+                self._bytes -= self._entradas.pop(clave)[2]
+            return len(claves)
+
+    def limpiar(self) -> None:
+        """Vacía la cache conservando los contadores"""
+        with self._lock:
+            for vuelo in self._en_vuelo.values():
+                vuelo.invalidado = True
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Aciertos, fallos, desalojos y ocupación actual"""
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "coalescidos": self.coalescidos,
+                "desalojos": self.desalojos,
+                "expirados": self.expirados,
+            }
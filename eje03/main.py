@@ -1,10 +1,15 @@
 import sys
 import os
+import threading
 import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from patrones import SingletonMeta
+from cache import CacheResultados
+from pool import ConexionSimulada, PoolConexiones
 
 class ConexionBD(metaclass=SingletonMeta):
     """
@@ -17,31 +22,152 @@ class ConexionBD(metaclass=SingletonMeta):
         self._conectado: bool = False
         self.host: str = "192.168.1.10"
         self.puerto: int = 5432
+        self.pool: Optional[PoolConexiones] = None
+        self.cache: Optional[Any] = None  # Cache de resultados (ver cache.CacheResultados)
+        self.latencia_consulta: float = 0.05
+        # Sincronización: una sola conexión/desconexión en curso a la vez
+        self._condicion = threading.Condition()
+        self._conectando: bool = False
+        self._desconectando: bool = False
+        self._referencias: int = 0  # Usuarios que llamaron a conectar() y aún no desconectan
+        self.conexiones_realizadas: int = 0
     
     def conectar(self) -> None:
-        """Establece la conexión si no está activa"""
-        if not self._conectado:
-            print(f"[BD] Iniciando conexión a {self.host}:{self.puerto}...")
+        """
+        Establece la conexión si no está activa
+        Si otro hilo ya está conectando, espera esa misma conexión en lugar de repetirla
+        Si esa conexión falla, el hilo que esperaba intenta conectar por su cuenta
+        """
+        with self._condicion:
+            en_curso = self._conectando
+            self._condicion.wait_for(lambda: not self._conectando and not self._desconectando)
+            if self._conectado:
+                self._referencias += 1
+                if not en_curso:
+                    print("[BD Warning] Ya existe una conexión activa, se retorna la sesión actual")
+                return
+            self._conectando = True
+        print(f"[BD] Iniciando conexión a {self.host}:{self.puerto}...")
+        exito = False
+        try:
             time.sleep(1) # Simulamos latencia de red
-            self._conectado = True
-            print("[BD] Conexión establecida exitosamente")
-        else:
-            print("[BD Warning] Ya existe una conexión activa, se retorna la sesión actual")
+            exito = True
+        finally:
+            with self._condicion:
+                # Solo una conexión establecida cuenta como sesión del llamador
+                if exito:
+                    self._conectado = True
+                    self._referencias += 1
+                    self.conexiones_realizadas += 1
+                self._conectando = False
+                self._condicion.notify_all()
+        print("[BD] Conexión establecida exitosamente")
 
     def desconectar(self) -> None:
-        """Cierra la conexión si está activa"""
-        if self._conectado:
-            print("[BD] Cerrando sesión...")
+        """
+        Libera la sesión del llamador; la conexión solo se cierra cuando
+        ningún otro usuario la sigue utilizando
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: not self._conectando and not self._desconectando)
+            if not self._conectado:
+                print("[BD Error] No se puede desconectar: No hay sesión activa")
+                return
+            self._referencias = max(0, self._referencias - 1)
+            if self._referencias > 0:
+                print(f"[BD] Sesión liberada, {self._referencias} usuario(s) siguen conectados")
+                return
+            self._desconectando = True
+        print("[BD] Cerrando sesión...")
+        try:
             time.sleep(0.5)
-            self._conectado = False
-            print("[BD] Desconectado correctamente")
-        else:
-            print("[BD Error] No se puede desconectar: No hay sesión activa")
+        finally:
+            with self._condicion:
+                self._conectado = False
+                self._desconectando = False
+                self._condicion.notify_all()
+        print("[BD] Desconectado correctamente")
+
+    def habilitar_pool(self, min_tam: int = 1, max_tam: int = 4, timeout_adquisicion: float = 5.0,
+                       max_inactividad: float = 30.0, latencia_consulta: float = 0.05) -> PoolConexiones:
+        """
+        Activa el modo con pool: varias conexiones físicas compartidas entre hilos
+        Las conexiones se abren de forma perezosa en el primer uso de sesion()
+        """
+        if self.pool is not None:
+            self.pool.cerrar()
+        self.pool = PoolConexiones(
+            lambda: ConexionSimulada(self.host, self.puerto, latencia_consulta=latencia_consulta),
+            min_tam=min_tam,
+            max_tam=max_tam,
+            timeout_adquisicion=timeout_adquisicion,
+            max_inactividad=max_inactividad,
+        )
+        return self.pool
+
+    @contextmanager
+    def sesion(self, timeout: Optional[float] = None) -> Iterator[ConexionSimulada]:
+        """Presta una conexión del pool durante el bloque `with`"""
+        if self.pool is None:
+            raise RuntimeError("El pool no está habilitado: llame primero a habilitar_pool()")
+        with self.pool.conexion(timeout) as conexion:
+            yield conexion
+
+    def configurar_cache(self, cache: Optional[Any] = None) -> None:
+        """
+        Instala la cache de resultados de consultar() (None la desactiva)
+        Admite cualquier objeto con la interfaz de CacheResultados
+        """
+        self.cache = cache
+
+    def consultar(self, consulta: str, usar_cache: bool = True) -> str:
+        """
+        Ejecuta una consulta, sirviéndola desde la cache si está configurada
+        Los fallos concurrentes sobre la misma consulta llegan una sola vez a la BD
+        """
+        if usar_cache and self.cache is not None:
+            return self.cache.obtener_o_calcular(consulta, lambda: self._ejecutar(consulta))
+        return self._ejecutar(consulta)
+
+    def _ejecutar(self, consulta: str) -> str:
+        """Envía la consulta a la BD por el pool o por la sesión única"""
+        if self.pool is not None:
+            with self.sesion() as conexion:
+                return conexion.ejecutar(consulta)
+        if not self._conectado:
+            raise ConnectionError("No hay sesión activa: llame primero a conectar()")
+        time.sleep(self.latencia_consulta) # Simulamos latencia de red
+        return f"resultado({consulta})"
+
+    def invalidar_cache(self, prefijo: str = "") -> int:
+        """Descarta de la cache las consultas que empiezan con `prefijo`"""
+        if self.cache is None:
+            return 0
+        return self.cache.invalidar_prefijo(prefijo)
+
+    def liberar(self) -> None:
+        """
+        Gancho de SingletonMeta.restablecer(): cierra el pool y la sesión
+        aunque todavía queden usuarios registrados
+        """
+        if self.pool is not None:
+            self.pool.cerrar()
+            self.pool = None
+        with self._condicion:
+            self._condicion.wait_for(lambda: not self._conectando and not self._desconectando)
+            if not self._conectado:
+                return
+            self._referencias = 1  # La próxima desconexión es la última
+        self.desconectar()
 
     def estado(self) -> None:
         """Imprime el estado actual de la conexión"""
         status = "ONLINE" if self._conectado else "OFFLINE"
         print(f"Estado del Sistema: {status}")
+        if self.pool is not None:
+            print(f"Pool: {self.pool.estadisticas()}")
+        if self.cache is not None:
+            print(f"Cache: {self.cache.estadisticas()}")
 
 # --- Bloque de Prueba ---
 if __name__ == "__main__":
@@ -66,7 +192,43 @@ if __name__ == "__main__":
     print("\n--- Verificación de Estado Cruzado ---")
     conexion_reportes.estado()
     
-    # 6. Desconexión
+    # 6. Desconexión: la sesión sigue viva mientras reportes la use
     print("\n--- Desconexión ---")
     conexion_principal.desconectar()
-    conexion_reportes.estado() # Debería estar offline también
\ No newline at end of file
+    conexion_reportes.estado() # Sigue online: reportes aún la usa
+    conexion_reportes.desconectar()
+    conexion_principal.estado() # Ahora sí está offline
+
+    # 7. Modo con pool: varios hilos consultan en paralelo
+    print("\n--- Modo Pool (2 a 4 conexiones, 8 hilos) ---")
+    conexion_principal.habilitar_pool(min_tam=2, max_tam=4)
+
+    def consultar(n: int) -> None:
+        with conexion_principal.sesion() as conexion:
+            conexion.ejecutar(f"SELECT * FROM pedidos WHERE id = {n}")
+
+    hilos = [threading.Thread(target=consultar, args=(n,)) for n in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    conexion_principal.estado()
+    conexion_principal.pool.cerrar()
+
+    # 8. Cache de resultados: lecturas repetidas de configuración
+    print("\n--- Cache de Consultas (TTL 60 s, LRU 128 entradas) ---")
+    conexion_principal.habilitar_pool(min_tam=1, max_tam=2)
+    conexion_principal.configurar_cache(CacheResultados(max_entradas=128, ttl=60.0))
+    consulta_config = "SELECT valor FROM config WHERE clave = 'idioma'"
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=conexion_principal.consultar, args=(consulta_config,)) for _ in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    for _ in range(1000):
+        conexion_principal.consultar(consulta_config)
+    print(f"1020 lecturas en {time.perf_counter() - inicio:.3f}s")
+    print(f"Invalidadas por prefijo 'SELECT valor FROM config': {conexion_principal.invalidar_cache('SELECT valor FROM config')}")
+    conexion_principal.estado()
+    conexion_principal.pool.cerrar()
@@ -0,0 +1,266 @@
+"""
+Pool de conexiones simuladas para ConexionBD.
+Reparte varias conexiones físicas entre hilos concurrentes con tamaño mínimo
+y máximo, calentamiento perezoso, desalojo de inactivas, chequeo de salud y
+tiempo límite de adquisición.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+
+class ConexionSimulada:
+    """Conexión física simulada con la misma latencia de red que ConexionBD"""
+
+    def __init__(self, host: str, puerto: int, latencia_conexion: float = 1.0,
+                 latencia_consulta: float = 0.05, latencia_cierre: float = 0.5):
+        self.host = host
+        self.puerto = puerto
+        self.latencia_consulta = latencia_consulta
+        self.latencia_cierre = latencia_cierre
+        time.sleep(latencia_conexion)  # Simulamos latencia de red
+        self.abierta = True
+        self.ultimo_uso = time.monotonic()
+
+    def ejecutar(self, consulta: str) -> str:
+        """Ejecuta una consulta simulada"""
+        if not self.abierta:
+            raise ConnectionError("La conexión está cerrada")
+        time.sleep(self.latencia_consulta)
+        return f"resultado({consulta})"
+
+    def esta_viva(self) -> bool:
+        """Chequeo de salud (equivalente a un 'SELECT 1')"""
+        return self.abierta
+
+    def cerrar(self) -> None:
+        """Cierra la conexión física"""
+        if self.abierta:
+            time.sleep(self.latencia_cierre)
+            self.abierta = False
+
+
+class _Espera:
+    """Hilo en espera de una conexión; se atienden en orden FIFO"""
+    __slots__ = ("evento", "conexion", "crear")
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.conexion: Optional[ConexionSimulada] = None
+        self.crear = False  # Se le cedió un hueco para abrir una conexión nueva
+
+
+class PoolConexiones:
+    """
+    Pool acotado de conexiones reutilizables
+    Las conexiones libres se entregan en orden LIFO para mantener calientes las
+    más recientes y dejar que las demás envejezcan hasta ser desalojadas.
+    Una conexión devuelta pasa directamente al hilo que más tiempo lleva
+    esperando, de modo que ningún hilo queda postergado indefinidamente
+    """
+
+    def __init__(self, fabrica: Callable[[], ConexionSimulada], min_tam: int = 1, max_tam: int = 4,
+                 timeout_adquisicion: float = 5.0, max_inactividad: float = 30.0):
+        if not 0 <= min_tam <= max_tam or max_tam < 1:
+            raise ValueError("Se requiere 0 <= min_tam <= max_tam y max_tam >= 1")
+        self.fabrica = fabrica
+        self.min_tam = min_tam
+        self.max_tam = max_tam
+        self.timeout_adquisicion = timeout_adquisicion
+        self.max_inactividad = max_inactividad
+        self._lock = threading.Lock()
+        self._libres: List[ConexionSimulada] = []
+        self._esperas: Deque[_Espera] = deque()
+        self._total = 0  # Conexiones abiertas o en proceso de apertura
+        self._en_uso = 0
+        self._cerrado = threading.Event()
+        self._calentado = False
+        self._desalojador: Optional[threading.Thread] = None
+        # Métricas
+        self._entregas = 0
+        self._latencia_total = 0.0
+        self._latencia_max = 0.0
+        self._creadas = 0
+        self._descartadas = 0
+
+    # ------------------------------------------------------------------
+    # Creación y calentamiento
+    # ------------------------------------------------------------------
+
+    def _crear(self) -> ConexionSimulada:
+        """Abre una conexión nueva; el hueco ya fue reservado en self._total"""
+        try:
+            conexion = self.fabrica()
+        except Exception:
+            self._liberar_hueco()
+            raise
+        with self._lock:
+            self._creadas += 1
+        return conexion
+
+    def _calentar(self) -> None:
+        """Completa en segundo plano las conexiones hasta min_tam"""
+        def abrir_una() -> None:
+            conexion = self._crear()
+            self.liberar(conexion, contar_entrega=False)
+
+        with self._lock:
+            faltantes = max(0, self.min_tam - self._total)
+            self._total += faltantes
+        for _ in range(faltantes):
+            threading.Thread(target=abrir_una, name="Pool-Calentamiento", daemon=True).start()
+        self._desalojador = threading.Thread(target=self._bucle_desalojo, name="Pool-Desalojo", daemon=True)
+        self._desalojador.start()
+
+    # ------------------------------------------------------------------
+    # Préstamo y devolución
+    # ------------------------------------------------------------------
+
+    def adquirir(self, timeout: Optional[float] = None) -> ConexionSimulada:
+        """
+        Obtiene una conexión sana del pool
+        Lanza TimeoutError si no hay ninguna disponible dentro del plazo
+        """
+        plazo = self.timeout_adquisicion if timeout is None else timeout
+        inicio = time.monotonic()
+        limite = inicio + plazo
+        with self._lock:
+            # Calentamiento perezoso: solo al primer uso
+            calentar = not self._calentado
+            self._calentado = True
+        if calentar:
+            self._calentar()
+        while True:
+            conexion: Optional[ConexionSimulada] = None
+            crear = False
+            espera: Optional[_Espera] = None
+            with self._lock:
+                if self._cerrado.is_set():
+                    raise RuntimeError("El pool está cerrado")
+                if self._libres and not self._esperas:
+                    conexion = self._libres.pop()
+                elif self._total < self.max_tam:
+                    self._total += 1
+                    crear = True
+                else:
+                    espera = _Espera()
+                    self._esperas.append(espera)
+            if espera is not None:
+                espera.evento.wait(max(0.0, limite - time.monotonic()))
+                with self._lock:
+                    if not espera.evento.is_set():
+                        self._esperas.remove(espera)
+                        raise TimeoutError(f"Sin conexiones libres tras {plazo:.2f}s")
+                if self._cerrado.is_set() and espera.conexion is None and not espera.crear:
+                    raise RuntimeError("El pool está cerrado")
+                conexion, crear = espera.conexion, espera.crear
+            if crear:
+                conexion = self._crear()
+            elif not conexion.esta_viva():
+                # Chequeo de salud fallido: se descarta y se intenta de nuevo
+                self._descartar(conexion)
+                continue
+            with self._lock:
+                self._en_uso += 1
+                self._entregas += 1
+                latencia = time.monotonic() - inicio
+                self._latencia_total += latencia
+                self._latencia_max = max(self._latencia_max, latencia)
+            return conexion
+
+    def liberar(self, conexion: ConexionSimulada, contar_entrega: bool = True) -> None:
+        """Devuelve una conexión al pool (o la cierra si el pool ya no la acepta)"""
+        with self._lock:
+            if contar_entrega:
+                self._en_uso -= 1
+            if not self._cerrado.is_set() and conexion.esta_viva():
+                conexion.ultimo_uso = time.monotonic()
+                if self._esperas:
+                    # Entrega directa al hilo que más tiempo lleva esperando
+                    espera = self._esperas.popleft()
+                    espera.conexion = conexion
+                    espera.evento.set()
+                else:
+                    self._libres.append(conexion)
+                return
+        self._descartar(conexion)
+
+    def _descartar(self, conexion: ConexionSimulada) -> None:
+        """Cierra una conexión y libera su hueco"""
+        conexion.cerrar()
+        with self._lock:
+            self._descartadas += 1
+        self._liberar_hueco()
+
+    def _liberar_hueco(self) -> None:
+        """Devuelve un hueco de self._total, cediéndolo a un hilo en espera si lo hay"""
+        with self._lock:
+            if self._esperas and not self._cerrado.is_set():
+                espera = self._esperas.popleft()
+                espera.crear = True
+                espera.evento.set()
+            else:
+                self._total -= 1
+
+    @contextmanager
+    def conexion(self, timeout: Optional[float] = None) -> Iterator[ConexionSimulada]:
+        """Préstamo con context manager: `with pool.conexion() as c: ...`"""
+        conexion = self.adquirir(timeout)
+        try:
+            yield conexion
+        finally:
+            self.liberar(conexion)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+
+    def desalojar_inactivas(self) -> int:
+        """Cierra las conexiones libres inactivas por encima de min_tam"""
+        ahora = time.monotonic()
+        desalojadas: List[ConexionSimulada] = []
+        with self._lock:
+            # Las más antiguas están al inicio de la pila LIFO
+            while (self._libres and self._total - len(desalojadas) > self.min_tam
+                   and ahora - self._libres[0].ultimo_uso > self.max_inactividad):
+                desalojadas.append(self._libres.pop(0))
+        for conexion in desalojadas:
+            self._descartar(conexion)
+        return len(desalojadas)
+
+    def _bucle_desalojo(self) -> None:
+        """Hilo de mantenimiento que desaloja periódicamente"""
+        while not self._cerrado.wait(max(self.max_inactividad / 2, 0.1)):
+            self.desalojar_inactivas()
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Esperando, latencia de préstamo y utilización del pool"""
+        with self._lock:
+            return {
+                "total": self._total,
+                "libres": len(self._libres),
+                "en_uso": self._en_uso,
+                "esperando": len(self._esperas),
+                "entregas": self._entregas,
+                "latencia_media_ms": 1000 * self._latencia_total / self._entregas if self._entregas else 0.0,
+                "latencia_max_ms": 1000 * self._latencia_max,
+                "utilizacion": self._en_uso / self.max_tam,
+                "creadas": self._creadas,
+                "descartadas": self._descartadas,
+            }
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones libres; las prestadas se cierran al devolverse"""
+        with self._lock:
+            self._cerrado.set()
+            libres, self._libres = self._libres, []
+            esperas, self._esperas = self._esperas, deque()
+        for espera in esperas:
+            espera.evento.set()
+        for conexion in libres:
+            self._descartar(conexion)
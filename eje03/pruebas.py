@@ -0,0 +1,191 @@
+"""
+Pruebas de concurrencia de ConexionBD (al estilo de eje05).
+Valida que 100 hilos que llaman a conectar() a la vez provocan una sola
+conexión, que el conteo de referencias evita cerrar una sesión en uso, que
+restablecer el Singleton cierra la sesión de la instancia anterior y que una
+invalidación de la cache durante un cálculo no deja guardado el valor viejo.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import List, Tuple
+
+from cache import CacheResultados
+from main import ConexionBD
+
+
+# ============================================================================
+# Pruebas de Concurrencia
+# ============================================================================
+
+
+class PruebasConexion:
+    """Suite de pruebas para validar conectar()/desconectar() bajo concurrencia."""
+
+    def __init__(self, num_hilos: int = 100) -> None:
+        self.conexion = ConexionBD()
+        self.num_hilos = num_hilos
+        self.resultados: List[str] = []
+
+    def agregar_resultado(self, msg: str) -> None:
+        """Agrega un resultado a la lista."""
+        self.resultados.append(msg)
+        print(msg)
+
+    def _en_paralelo(self, funcion) -> None:
+        """Lanza num_hilos hilos que ejecutan `funcion` al mismo tiempo."""
+        barrera = threading.Barrier(self.num_hilos)
+
+        def tarea() -> None:
+            barrera.wait()
+            funcion()
+
+        hilos = [threading.Thread(target=tarea, name=f"Hilo-{i+1}") for i in range(self.num_hilos)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    def prueba_conexion_unica(self) -> bool:
+        """
+        Prueba 1: Hilos que compiten por conectar provocan una única conexión.
+        """
+        print("\n" + "=" * 70)
+        print(f"PRUEBA 1: CONEXIÓN ÚNICA ({self.num_hilos} HILOS EN CARRERA)")
+        print("=" * 70)
+
+        previas = self.conexion.conexiones_realizadas
+        self._en_paralelo(self.conexion.conectar)
+        realizadas = self.conexion.conexiones_realizadas - previas
+        resultado = realizadas == 1 and self.conexion._referencias == self.num_hilos
+
+        self.agregar_resultado(f"Conexiones realizadas: {realizadas} (esperado: 1)")
+        self.agregar_resultado(f"Referencias activas: {self.conexion._referencias} (esperado: {self.num_hilos})")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
+    def prueba_conteo_referencias(self) -> bool:
+        """
+        Prueba 2: La conexión sigue activa hasta que se va el último usuario.
+        """
+        print("\n" + "=" * 70)
+        print("PRUEBA 2: CONTEO DE REFERENCIAS")
+        print("=" * 70)
+
+        barrera = threading.Barrier(self.num_hilos - 1)
+
+        def desconectar_todos_menos_uno() -> None:
+            barrera.wait()
+            self.conexion.desconectar()
+
+        hilos = [threading.Thread(target=desconectar_todos_menos_uno) for _ in range(self.num_hilos - 1)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        sigue_activa = self.conexion._conectado
+
+        self.conexion.desconectar()
+        cerrada = not self.conexion._conectado
+        resultado = sigue_activa and cerrada and self.conexion._referencias == 0
+
+        self.agregar_resultado(f"Activa tras {self.num_hilos - 1} desconexiones: {sigue_activa}")
+        self.agregar_resultado(f"Cerrada tras la última desconexión: {cerrada}")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
+    def prueba_restablecer(self) -> bool:
+        """
+        Prueba 3: ConexionBD.restablecer() cierra la sesión aunque siga en uso
+        y la próxima ConexionBD() es una instancia nueva y desconectada.
+        """
+        print("\n" + "=" * 70)
+        print("PRUEBA 3: RESTABLECER EL SINGLETON LIBERA LA SESIÓN")
+        print("=" * 70)
+
+        anterior = ConexionBD()
+        anterior.conectar()
+        anterior.conectar()  # Dos usuarios activos
+        ConexionBD.restablecer()
+        nueva = ConexionBD()
+        resultado = not anterior._conectado and nueva is not anterior and not nueva._conectado
+        self.conexion = nueva
+
+        self.agregar_resultado(f"Sesión anterior cerrada: {not anterior._conectado}")
+        self.agregar_resultado(f"Nueva instancia: {nueva is not anterior} | conectada: {nueva._conectado}")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
+    def prueba_invalidar_en_vuelo(self) -> bool:
+        """
+        Prueba 4: invalidar_prefijo() mientras un hilo calcula la clave hace que
+        ese resultado no se guarde y la siguiente lectura vuelva a calcular.
+        """
+        print("\n" + "=" * 70)
+        print("PRUEBA 4: INVALIDACIÓN DURANTE UN CÁLCULO LENTO")
+        print("=" * 70)
+
+        cache = CacheResultados(ttl=60.0)
+        consulta = "SELECT valor FROM config WHERE clave = 'idioma'"
+        version = [1]
+        calculando = threading.Event()
+        continuar = threading.Event()
+
+        def calcular_lento() -> str:
+            leida = version[0]  # Lee la BD antes de la invalidación
+            calculando.set()
+            continuar.wait()
+            return f"idioma v{leida}"
+
+        lider = threading.Thread(target=cache.obtener_o_calcular, args=(consulta, calcular_lento))
+        lider.start()
+        calculando.wait()
+        version[0] = 2  # Se escribe la BD y se invalida mientras el cálculo sigue en curso
+        cache.invalidar_prefijo("SELECT valor FROM config")
+        continuar.set()
+        lider.join()
+
+        valor = cache.obtener_o_calcular(consulta, lambda: f"idioma v{version[0]}")
+        resultado = valor == "idioma v2" and cache.estadisticas()["fallos"] == 2
+
+        self.agregar_resultado(f"Lectura tras invalidar: {valor!r} (esperado 'idioma v2')")
+        self.agregar_resultado(f"Cálculos: {cache.estadisticas()['fallos']} (esperado: 2)")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
+    def ejecutar_todas(self) -> None:
+        """Ejecuta todas las pruebas y genera reporte final."""
+        resultados_pruebas: List[Tuple[str, bool]] = []
+        resultados_pruebas.append(("Conexión Única", self.prueba_conexion_unica()))
+        resultados_pruebas.append(("Conteo de Referencias", self.prueba_conteo_referencias()))
+        resultados_pruebas.append(("Restablecer", self.prueba_restablecer()))
+        resultados_pruebas.append(("Invalidar en Vuelo", self.prueba_invalidar_en_vuelo()))
+
+        # Reporte final
+        print("\n" + "=" * 70)
+        print("REPORTE FINAL")
+        print("=" * 70)
+        total = len(resultados_pruebas)
+        exitosas = sum(1 for _, result in resultados_pruebas if result)
+        for nombre, resultado in resultados_pruebas:
+            estado = "✓ EXITOSA" if resultado else "✗ FALLIDA"
+            print(f"{nombre:.<40} {estado}")
+
+        print("-" * 70)
+        print(f"Resultado: {exitosas}/{total} pruebas exitosas")
+        if exitosas == total:
+            print("✓ TODAS LAS PRUEBAS EXITOSAS - conectar()/desconectar() son THREAD-SAFE")
+        else:
+            print(f"✗ {total - exitosas} prueba(s) fallida(s)")
+        print("=" * 70)
+
+
+# ============================================================================
+# Ejecucion principal
+# ============================================================================
+
+
+if __name__ == "__main__":
+    pruebas = PruebasConexion()
+    pruebas.ejecutar_todas()
@@ -0,0 +1,119 @@
+"""Almacén de objetos en columnas NumPy (struct-of-arrays) - módulo separado."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy es opcional
+    np = None
+
+if TYPE_CHECKING:
+    from perfil import Perfilador
+
+# (x, y, tipo, radio) de cada objeto visible; tipo es el valor de TipoObjeto
+Visible = Tuple[int, float, int, int]
+# Copias inmutables de las columnas (x, y, velocidad, tipo, radio)
+Columnas = Tuple[Tuple[int, ...], Tuple[float, ...], Tuple[float, ...], Tuple[int, ...], Tuple[int, ...]]
+
+
+class AlmacenNumpy:
+    """
+    Guarda los objetos que caen como columnas paralelas (x, y, velocidad, tipo, radio).
+    El movimiento, las colisiones y las bajas se calculan con operaciones
+    vectorizadas; a Python solo vuelven los tipos de los objetos tocados y caídos.
+    """
+
+    def __init__(self, capacidad: int = 256) -> None:
+        if np is None:
+            raise RuntimeError("AlmacenNumpy requiere numpy instalado")
+        self._n = 0
+        self._x = np.zeros(capacidad, dtype=np.int64)
+        self._y = np.zeros(capacidad, dtype=np.float64)
+        self._vel = np.zeros(capacidad, dtype=np.float64)
+        self._tipo = np.zeros(capacidad, dtype=np.int8)
+        self._radio = np.zeros(capacidad, dtype=np.int64)
+
+    def _columnas(self) -> Tuple["np.ndarray", ...]:
+        return self._x, self._y, self._vel, self._tipo, self._radio
+
+    def _crecer(self) -> None:
+        """Duplica la capacidad de todas las columnas."""
+        nuevas = []
+        for columna in self._columnas():
+            nueva = np.zeros(len(columna) * 2, dtype=columna.dtype)
+            nueva[: self._n] = columna[: self._n]
+            nuevas.append(nueva)
+        self._x, self._y, self._vel, self._tipo, self._radio = nuevas
+
+    def __len__(self) -> int:
+        return self._n
+
+    def agregar(self, x: int, y: float, tipo: int, radio: int, velocidad: float) -> None:
+        """Agrega un objeto al final de las columnas (O(1) amortizado)."""
+        if self._n == len(self._y):
+            self._crecer()
+        i = self._n
+        self._x[i] = x
+        self._y[i] = y
+        self._vel[i] = velocidad
+        self._tipo[i] = tipo
+        self._radio[i] = radio
+        self._n += 1
+
+    def avanzar(self, jx: int, jy: int, jx_fin: int, jy_fin: int, alto: int,
+                perfil: Optional["Perfilador"] = None) -> Tuple[List[int], List[int]]:
+        """
+        Mueve todos los objetos un paso y quita los que tocaron la barra
+        [jx, jx_fin) x [jy, jy_fin) o pasaron el borde inferior.
+        Devuelve (tipos tocados, tipos caídos sin tocar).
+        Con `perfil` marca las fases "mover", "colisiones" y "quitar".
+        """
+        n = self._n
+        if n == 0:
+            return [], []
+        y = self._y[:n]
+        y += self._vel[:n]
+        if perfil is not None:
+            perfil.marca("mover")
+        radio = self._radio[:n]
+        lado = radio * 2
+        ox = self._x[:n] - radio
+        oy = (y - radio).astype(np.int64)  # Trunca hacia cero, igual que int()
+        # Misma prueba que pygame.Rect.colliderect
+        tocados = (oy < jy_fin) & (oy + lado > jy) & (ox < jx_fin) & (ox + lado > jx)
+        caidos = (y > alto) & ~tocados
+        tipo = self._tipo[:n]
+        tipos_tocados = tipo[tocados].tolist()
+        tipos_caidos = tipo[caidos].tolist()
+        if perfil is not None:
+            perfil.marca("colisiones")
+        if tipos_tocados or tipos_caidos:
+            self._compactar(tocados | caidos)
+        if perfil is not None:
+            perfil.marca("quitar")
+        return tipos_tocados, tipos_caidos
+
+    def _compactar(self, eliminar: "np.ndarray") -> None:
+        """Swap-remove vectorizado: los sobrevivientes del final llenan los huecos."""
+        indices = np.flatnonzero(eliminar)
+        n_nuevo = self._n - len(indices)
+        huecos = indices[indices < n_nuevo]
+        relleno = np.flatnonzero(~eliminar[n_nuevo:]) + n_nuevo
+        for columna in self._columnas():
+            columna[huecos] = columna[relleno]
+        self._n = n_nuevo
+
+    def visibles(self) -> Iterator[Visible]:
+        """Recorre (x, y, tipo, radio) de cada objeto para dibujarlo."""
+        n = self._n
+        return zip(self._x[:n].tolist(), self._y[:n].tolist(), self._tipo[:n].tolist(), self._radio[:n].tolist())
+
+    def columnas(self) -> Columnas:
+        """Copia de las columnas como tuplas (para instantáneas)."""
+        n = self._n
+        return tuple(tuple(columna[:n].tolist()) for columna in self._columnas())  # type: ignore[return-value]
+
+    def vaciar(self) -> None:
+        self._n = 0
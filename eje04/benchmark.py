@@ -0,0 +1,119 @@
+"""
+Benchmark de render de InterfazJuego - módulo separado.
+Juega una partida con semilla y muchos objetos en pantalla y mide el tiempo
+de InterfazJuego.dibujar() por frame (media, p50, p99) y la fracción de la
+pantalla enviada al display, con render parcial (rectángulos sucios) o
+completo. Con --hilos mide además TPS y FPS de la simulación en hilo con un
+retraso artificial por frame, para ver que un render lento no frena la lógica.
+Sin display usa el driver "dummy" de SDL, así que también corre en
+servidores (donde el costo de enviar píxeles al display es casi nulo).
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import statistics
+import time
+from typing import Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from estado import Ajustes, ControlJuego
+from interfaz import InterfazJuego
+
+
+def medir_render(frames: int = 600, calentamiento: int = 600, freq: int = 60,
+                 velocidad: float = 1.0, semilla: int = 1, render_parcial: bool = True) -> Dict[str, float]:
+    """Devuelve estadísticas en ms del tiempo de dibujar() por frame."""
+    ajustes = dataclasses.replace(
+        Ajustes(), freq_bloque=freq, freq_enemigo=freq, vidas_ini=10 ** 9,
+        bloque_vel_ini=velocidad, enemigo_vel_ini=velocidad, bloque_vel_inc=0.0, enemigo_vel_inc=0.0,
+    )
+    ControlJuego().configurar(ajustes, semilla)
+    interfaz = InterfazJuego(render_parcial)
+    paso_ms = 1000 / 60
+    tiempos: List[float] = []
+    areas: List[int] = []
+    try:
+        for tick in range(calentamiento):
+            interfaz.control.actualizar(int(tick * paso_ms))
+            interfaz.dibujar()
+        for tick in range(calentamiento, calentamiento + frames):
+            interfaz.control.actualizar(int(tick * paso_ms))
+            inicio = time.perf_counter()
+            interfaz.dibujar()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            areas.append(interfaz.area_actualizada)
+    finally:
+        interfaz.cerrar()
+    percentiles = statistics.quantiles(tiempos, n=100)
+    return {
+        "objetos": interfaz.control.num_objetos(),
+        "media_ms": statistics.fmean(tiempos),
+        "p50_ms": percentiles[49],
+        "p99_ms": percentiles[98],
+        "fps_max": 1000 / statistics.fmean(tiempos),
+        "area_%": 100 * statistics.fmean(areas) / (interfaz.cfg.ancho * interfaz.cfg.alto),
+    }
+
+
+def medir_hilos(segundos: float = 3.0, retraso_ms: float = 0.0, tps: int = 60, fps: int = 60,
+                semilla: int = 1) -> Dict[str, float]:
+    """TPS y FPS medidos con la simulación en hilo y `retraso_ms` extra por frame."""
+    ControlJuego().configurar(dataclasses.replace(Ajustes(), vidas_ini=10 ** 9), semilla)
+    interfaz = InterfazJuego(hilos=True, fps=fps, tps=tps)
+    simulacion = interfaz.simulacion
+    simulacion.iniciar()
+    frames = 0
+    inicio = time.perf_counter()
+    try:
+        while time.perf_counter() - inicio < segundos:
+            interfaz.dibujar()
+            time.sleep(retraso_ms / 1000)
+            interfaz.reloj.tick(fps)
+            frames += 1
+    finally:
+        interfaz.cerrar()
+    duracion = time.perf_counter() - inicio
+    return {
+        "retraso_ms": retraso_ms,
+        "fps": frames / duracion,
+        "tps": simulacion.ticks / duracion,
+        "descartados": simulacion.descartados,
+        "ms_por_tick": simulacion.estadisticas()["ms_por_tick"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--calentamiento", type=int, default=600, help="Frames previos para poblar la pantalla")
+    parser.add_argument("--freq", type=int, default=60, help="ms entre apariciones de bloques y enemigos")
+    parser.add_argument("--velocidad", type=float, default=1.0, help="Velocidad de caída de los objetos")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--modos", nargs="+", choices=["parcial", "completo"], default=["parcial", "completo"],
+                        help="parcial = rectángulos sucios; completo = fill + flip en cada frame")
+    parser.add_argument("--hilos", nargs="*", type=float, metavar="MS",
+                        help="Mide TPS/FPS con la simulación en hilo y estos retrasos de render (por defecto 0 y 40)")
+    args = parser.parse_args()
+    print("=" * 60)
+    print("RENDER: TIEMPO DE dibujar() POR FRAME")
+    print("=" * 60)
+    for modo in args.modos:
+        resultado = medir_render(args.frames, args.calentamiento, args.freq, args.velocidad,
+                                 args.semilla, render_parcial=modo == "parcial")
+        print(f"[{modo}]")
+        for clave, valor in resultado.items():
+            print(f"  {clave:<10} {valor:>10.3f}" if isinstance(valor, float) else f"  {clave:<10} {valor:>10}")
+    if args.hilos is not None:
+        print("[hilos] simulación a 60 TPS, render con retraso artificial")
+        for retraso in args.hilos or [0.0, 40.0]:
+            resultado = medir_hilos(retraso_ms=retraso, semilla=args.semilla)
+            print("  " + " | ".join(f"{clave} {valor:.2f}" if isinstance(valor, float) else f"{clave} {valor}"
+                                    for clave, valor in resultado.items()))
+
+
+if __name__ == "__main__":
+    main()
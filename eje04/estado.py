@@ -7,9 +7,7 @@ import sys
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Tuple
-
-import pygame
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 # Agrega la carpeta raiz (..\) para importar patrones.py
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -17,6 +15,8 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from patrones import SingletonMeta
+from almacen import AlmacenNumpy, Columnas, Visible, np
+from perfil import Perfilador
 
 
 # ============================================================================
@@ -30,15 +30,240 @@ class TipoObjeto(Enum):
     ENEMIGO = 2  # Resta vidas
 
 
-@dataclass
+# Valores enteros usados por los almacenes de objetos
+BLOQUE = TipoObjeto.BLOQUE.value
+ENEMIGO = TipoObjeto.ENEMIGO.value
+
+# Objetos en pantalla a partir de los cuales AlmacenNumpy avanza más rápido que
+# AlmacenLista: el costo fijo de NumPy ronda 25 µs por tick y la lista suma
+# ~0.4 µs por objeto (medido con avanzar(); se cruzan cerca de 56-60 objetos)
+UMBRAL_NUMPY = 56
+
+
 class Objeto:
-    """Representa un bloque o enemigo que cae."""
-    x: int
-    y: float
-    tipo: TipoObjeto
-    radio: int
-    color: Tuple[int, int, int]
-    velocidad: float
+    """
+    Representa un bloque o enemigo que cae.
+    Usa __slots__ (sin __dict__ por instancia) y se recicla con PoolObjetos.
+    """
+
+    __slots__ = ("x", "y", "tipo", "radio", "color", "velocidad", "fila")
+
+    def __init__(self, x: int, y: float, tipo: TipoObjeto, radio: int,
+                 color: Tuple[int, int, int], velocidad: float) -> None:
+        self.asignar(x, y, tipo, radio, color, velocidad)
+
+    def asignar(self, x: int, y: float, tipo: TipoObjeto, radio: int,
+                color: Tuple[int, int, int], velocidad: float) -> None:
+        """Carga todos los campos (al crear o al reutilizar desde el pool)."""
+        self.x = x
+        self.y = y
+        self.tipo = tipo
+        self.radio = radio
+        self.color = color
+        self.velocidad = velocidad
+        self.fila = 0  # Franja de la rejilla de colisiones
+
+    def __repr__(self) -> str:
+        return (f"Objeto(x={self.x}, y={self.y}, tipo={self.tipo}, radio={self.radio}, "
+                f"color={self.color}, velocidad={self.velocidad})")
+
+
+class PoolObjetos:
+    """
+    Lista libre de Objeto: los objetos atrapados o caídos vuelven al pool y se
+    reutilizan en la próxima aparición en lugar de crear instancias nuevas.
+    al_adquirir / al_liberar: funciones opcionales que reciben el objeto.
+    """
+
+    def __init__(self, capacidad: int = 256,
+                 al_adquirir: Optional[Callable[[Objeto], None]] = None,
+                 al_liberar: Optional[Callable[[Objeto], None]] = None) -> None:
+        self.al_adquirir = al_adquirir
+        self.al_liberar = al_liberar
+        self._libres: List[Objeto] = [
+            Objeto(0, 0.0, TipoObjeto.BLOQUE, 0, (0, 0, 0), 0.0) for _ in range(capacidad)
+        ]
+        self.vivos = 0
+        self.max_vivos = 0
+        self.creados = capacidad  # Instancias construidas, incluidas las preasignadas
+        self.adquiridos = 0
+        self.reutilizados = 0  # Adquisiciones servidas desde la lista libre
+
+    def adquirir(self, x: int, y: float, tipo: TipoObjeto, radio: int,
+                 color: Tuple[int, int, int], velocidad: float) -> Objeto:
+        """Toma un objeto libre (o crea uno si el pool está vacío) y lo inicializa."""
+        if self._libres:
+            obj = self._libres.pop()
+            obj.asignar(x, y, tipo, radio, color, velocidad)
+            self.reutilizados += 1
+        else:
+            obj = Objeto(x, y, tipo, radio, color, velocidad)
+            self.creados += 1
+        self.adquiridos += 1
+        self.vivos += 1
+        if self.vivos > self.max_vivos:
+            self.max_vivos = self.vivos
+        if self.al_adquirir is not None:
+            self.al_adquirir(obj)
+        return obj
+
+    def liberar(self, obj: Objeto) -> None:
+        """Devuelve un objeto al pool; no debe seguir usándose."""
+        if self.al_liberar is not None:
+            self.al_liberar(obj)
+        self.vivos -= 1
+        self._libres.append(obj)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Objetos vivos, máximo histórico, libres y proporción de adquisiciones reutilizadas."""
+        return {
+            "vivos": self.vivos,
+            "max_vivos": self.max_vivos,
+            "libres": len(self._libres),
+            "creados": self.creados,
+            "adquiridos": self.adquiridos,
+            "tasa_reuso": self.reutilizados / self.adquiridos if self.adquiridos else 0.0,
+        }
+
+
+# ============================================================================
+# Broad-phase de colisiones
+# ============================================================================
+
+
+class RejillaFilas:
+    """
+    Agrupa los objetos en franjas horizontales de `alto_fila` píxeles.
+    Cada objeto guarda su franja y solo cambia de cubeta al cruzar un borde,
+    así la fase fina se limita a las franjas que tocan la banda del jugador.
+    """
+
+    def __init__(self, alto_fila: int) -> None:
+        self.alto_fila = max(1, alto_fila)
+        self.radio_max = 0
+        self._filas: Dict[int, Dict[int, Objeto]] = {}
+
+    def fila_de(self, y: float) -> int:
+        """Franja que contiene la coordenada y."""
+        return int(y // self.alto_fila)
+
+    def insertar(self, obj: Objeto) -> None:
+        obj.fila = self.fila_de(obj.y)
+        self._filas.setdefault(obj.fila, {})[id(obj)] = obj
+        self.radio_max = max(self.radio_max, obj.radio)
+
+    def quitar(self, obj: Objeto) -> None:
+        cubeta = self._filas[obj.fila]
+        del cubeta[id(obj)]
+        if not cubeta:
+            del self._filas[obj.fila]
+
+    def mover(self, obj: Objeto, fila: int) -> None:
+        """Pasa el objeto a otra franja (solo se llama al cruzar un borde)."""
+        self.quitar(obj)
+        obj.fila = fila
+        self._filas.setdefault(fila, {})[id(obj)] = obj
+
+    def en_franja(self, y_min: float, y_max: float) -> Iterator[Objeto]:
+        """Objetos cuyas franjas se solapan con [y_min, y_max]."""
+        for fila in range(self.fila_de(y_min), self.fila_de(y_max) + 1):
+            cubeta = self._filas.get(fila)
+            if cubeta:
+                yield from list(cubeta.values())
+
+    def desde(self, y_min: float) -> Iterator[Objeto]:
+        """Objetos en franjas a partir de la que contiene y_min."""
+        inicio = self.fila_de(y_min)
+        for fila in [f for f in self._filas if f >= inicio]:
+            yield from list(self._filas[fila].values())
+
+    def vaciar(self) -> None:
+        self._filas.clear()
+        self.radio_max = 0
+
+
+class AlmacenLista:
+    """
+    Almacén de respaldo sin numpy: una lista de Objeto más la RejillaFilas.
+    Misma interfaz que almacen.AlmacenNumpy.
+    """
+
+    def __init__(self, alto_fila: int, colores: Dict[int, Tuple[int, int, int]],
+                 pool: Optional[PoolObjetos] = None) -> None:
+        self.objetos: List[Objeto] = []
+        self.rejilla = RejillaFilas(alto_fila)
+        self.pool = pool or PoolObjetos()
+        self._colores = colores
+
+    def __len__(self) -> int:
+        return len(self.objetos)
+
+    def agregar(self, x: int, y: float, tipo: int, radio: int, velocidad: float) -> None:
+        obj = self.pool.adquirir(x, y, TipoObjeto(tipo), radio, self._colores[tipo], velocidad)
+        self.objetos.append(obj)
+        self.rejilla.insertar(obj)
+
+    def avanzar(self, jx: int, jy: int, jx_fin: int, jy_fin: int, alto: int,
+                perfil: Optional[Perfilador] = None) -> Tuple[List[int], List[int]]:
+        """Mueve los objetos y devuelve (tipos tocados, tipos caídos sin tocar)."""
+        # Mover objetos; la rejilla solo se toca cuando un objeto cambia de franja
+        rejilla = self.rejilla
+        alto_fila = rejilla.alto_fila
+        for obj in self.objetos:
+            obj.y += obj.velocidad
+            fila = int(obj.y // alto_fila)
+            if fila != obj.fila:
+                rejilla.mover(obj, fila)
+        if perfil is not None:
+            perfil.marca("mover")
+
+        # Fase fina solo sobre las franjas que tocan la banda del jugador.
+        # Misma prueba que pygame.Rect.colliderect, con enteros y sin crear Rects
+        eliminados: Dict[int, Objeto] = {}
+        tocados: List[int] = []
+        caidos: List[int] = []
+        margen = rejilla.radio_max + 1
+        for obj in rejilla.en_franja(jy - margen, jy_fin + margen):
+            lado = obj.radio * 2
+            ox = obj.x - obj.radio
+            oy = int(obj.y - obj.radio)
+            if ox < jx_fin and jx < ox + lado and oy < jy_fin and jy < oy + lado:
+                tocados.append(obj.tipo.value)
+                eliminados[id(obj)] = obj
+
+        # Objetos que cayeron sin ser tocados: solo las franjas bajo el borde
+        for obj in rejilla.desde(alto):
+            if obj.y > alto and id(obj) not in eliminados:
+                caidos.append(obj.tipo.value)
+                eliminados[id(obj)] = obj
+        if perfil is not None:
+            perfil.marca("colisiones")
+
+        # Eliminar objetos fuera de pantalla o colisionados
+        if eliminados:
+            for obj in eliminados.values():
+                rejilla.quitar(obj)
+            self.objetos = [obj for obj in self.objetos if id(obj) not in eliminados]
+            for obj in eliminados.values():
+                self.pool.liberar(obj)
+        if perfil is not None:
+            perfil.marca("quitar")
+        return tocados, caidos
+
+    def visibles(self) -> Iterator[Visible]:
+        return ((obj.x, obj.y, obj.tipo.value, obj.radio) for obj in self.objetos)
+
+    def columnas(self) -> Columnas:
+        if not self.objetos:
+            return (), (), (), (), ()
+        filas = ((obj.x, obj.y, obj.velocidad, obj.tipo.value, obj.radio) for obj in self.objetos)
+        return tuple(zip(*filas))  # type: ignore[return-value]
+
+    def vaciar(self) -> None:
+        for obj in self.objetos:
+            self.pool.liberar(obj)
+        self.objetos.clear()
+        self.rejilla.vaciar()
 
 
 # ============================================================================
@@ -67,6 +292,28 @@ class Ajustes:
     vidas_ini: int = 3
     freq_bloque: int = 1000  # ms
     freq_enemigo: int = 1500  # ms
+    almacen: str = "auto"  # "numpy", "lista" o "auto" (según objetos_estimados(), ver UMBRAL_NUMPY)
+
+    def objetos_estimados(self, paso_ms: float = 1000 / 60) -> float:
+        """Objetos en pantalla a la vez al empezar: ticks que tarda en caer cada uno por apariciones por tick."""
+        ticks_bloque = (self.alto + self.objeto_radio) / self.bloque_vel_ini
+        ticks_enemigo = (self.alto + self.objeto_radio) / self.enemigo_vel_ini
+        return (ticks_bloque * paso_ms / self.freq_bloque
+                + ticks_enemigo * paso_ms / self.freq_enemigo)
+
+
+@dataclass(frozen=True)
+class InstantaneaJuego:
+    """Copia inmutable del estado visible tras un tick (para dibujar desde otro hilo)."""
+    puntaje: int
+    vidas: int
+    juego_activo: bool
+    jugador_x: int
+    xs: Tuple[int, ...]
+    ys: Tuple[float, ...]
+    velocidades: Tuple[float, ...]
+    tipos: Tuple[int, ...]
+    radios: Tuple[int, ...]
 
 
 # ============================================================================
@@ -81,52 +328,61 @@ class ControlJuego(metaclass=SingletonMeta):
     """
 
     def __init__(self) -> None:
-        if getattr(self, "_init_ok", False):
-            return
-        self._init_ok = True
         self.cfg = Ajustes()
+        self.pool_objetos = PoolObjetos()  # Se conserva entre partidas
+        self.almacen: Optional[Union[AlmacenNumpy, AlmacenLista]] = None
+        self.perfil: Optional[Perfilador] = None  # Si se asigna, actualizar() marca sus fases
         self.reiniciar()
 
-    def reiniciar(self) -> None:
-        """Reinicia la partida con estado inicial."""
+    def configurar(self, cfg: Ajustes, semilla: Optional[int] = None) -> None:
+        """Cambia los ajustes (p. ej. dificultad) y reinicia la partida."""
+        self.cfg = cfg
+        self.reiniciar(semilla)
+
+    def reiniciar(self, semilla: Optional[int] = None) -> None:
+        """
+        Reinicia la partida con estado inicial.
+        Con `semilla` la aparición de objetos es reproducible.
+        """
+        self.rng = random.Random(semilla)
         self.puntaje = 0
         self.vidas = self.cfg.vidas_ini
         self.vel_bloque = self.cfg.bloque_vel_ini
         self.vel_enemigo = self.cfg.enemigo_vel_ini
         self.juego_activo = True
         self.jugador_x = (self.cfg.ancho - self.cfg.paddle_ancho) // 2
-        self.objetos: List[Objeto] = []
+        if self.almacen is not None:
+            self.almacen.vaciar()  # Devuelve los objetos de la partida anterior al pool
+        self.almacen = self._crear_almacen()
         self.tiempo_ultimo_bloque = 0
         self.tiempo_ultimo_enemigo = 0
 
+    def _crear_almacen(self) -> Union[AlmacenNumpy, AlmacenLista]:
+        """Crea el almacén de objetos indicado en los ajustes."""
+        modo = self.cfg.almacen
+        if modo == "auto":
+            # Con pocos objetos el costo fijo de cada llamada a NumPy domina
+            modo = "numpy" if np is not None and self.cfg.objetos_estimados() >= UMBRAL_NUMPY else "lista"
+        if modo == "numpy":
+            return AlmacenNumpy()
+        if modo not in ("auto", "lista"):
+            raise ValueError(f"Almacén desconocido: {modo!r}")
+        colores = {BLOQUE: self.cfg.color_bloque, ENEMIGO: self.cfg.color_enemigo}
+        # Franjas del alto de la banda del jugador más un objeto
+        return AlmacenLista(self.cfg.paddle_alto + 2 * self.cfg.objeto_radio, colores, self.pool_objetos)
+
     def _crear_bloque(self, tiempo_actual: int) -> None:
         """Crea un bloque nuevo si es tiempo."""
         if tiempo_actual - self.tiempo_ultimo_bloque > self.cfg.freq_bloque:
-            x = random.randint(self.cfg.objeto_radio, self.cfg.ancho - self.cfg.objeto_radio)
-            bloque = Objeto(
-                x=x,
-                y=-self.cfg.objeto_radio,
-                tipo=TipoObjeto.BLOQUE,
-                radio=self.cfg.objeto_radio,
-                color=self.cfg.color_bloque,
-                velocidad=self.vel_bloque,
-            )
-            self.objetos.append(bloque)
+            x = self.rng.randint(self.cfg.objeto_radio, self.cfg.ancho - self.cfg.objeto_radio)
+            self.almacen.agregar(x, -self.cfg.objeto_radio, BLOQUE, self.cfg.objeto_radio, self.vel_bloque)
             self.tiempo_ultimo_bloque = tiempo_actual
 
     def _crear_enemigo(self, tiempo_actual: int) -> None:
         """Crea un enemigo nuevo si es tiempo."""
         if tiempo_actual - self.tiempo_ultimo_enemigo > self.cfg.freq_enemigo:
-            x = random.randint(self.cfg.objeto_radio, self.cfg.ancho - self.cfg.objeto_radio)
-            enemigo = Objeto(
-                x=x,
-                y=-self.cfg.objeto_radio,
-                tipo=TipoObjeto.ENEMIGO,
-                radio=self.cfg.objeto_radio,
-                color=self.cfg.color_enemigo,
-                velocidad=self.vel_enemigo,
-            )
-            self.objetos.append(enemigo)
+            x = self.rng.randint(self.cfg.objeto_radio, self.cfg.ancho - self.cfg.objeto_radio)
+            self.almacen.agregar(x, -self.cfg.objeto_radio, ENEMIGO, self.cfg.objeto_radio, self.vel_enemigo)
             self.tiempo_ultimo_enemigo = tiempo_actual
 
     def mover_jugador(self, dx: int) -> None:
@@ -138,47 +394,65 @@ class ControlJuego(metaclass=SingletonMeta):
     def actualizar(self, tiempo_actual: int) -> None:
         """
         Actualiza la lógica del juego: objetos, colisiones, puntuación.
+        Con `perfil` marca las fases "aparecer", "mover", "colisiones", "quitar" y "puntaje".
         """
         if not self.juego_activo:
             return
+        perfil = self.perfil
 
         # Crear nuevos objetos
         self._crear_bloque(tiempo_actual)
         self._crear_enemigo(tiempo_actual)
+        if perfil is not None:
+            perfil.marca("aparecer")
 
-        # Mover objetos y detectar colisiones
-        objetos_a_eliminar = []
-        jugador_rect = pygame.Rect(self.jugador_x, self.cfg.alto - 40, self.cfg.paddle_ancho, self.cfg.paddle_alto)
+        # Mover, detectar colisiones y quitar bajas dentro del almacén;
+        # solo vuelven los tipos de los objetos tocados y caídos
+        jx = self.jugador_x
+        jy = self.cfg.alto - 40
+        tocados, caidos = self.almacen.avanzar(
+            jx, jy, jx + self.cfg.paddle_ancho, jy + self.cfg.paddle_alto, self.cfg.alto, perfil
+        )
 
-        for i, obj in enumerate(self.objetos):
-            obj.y += obj.velocidad
+        # Colisión con jugador
+        for tipo in tocados:
+            if tipo == BLOQUE:
+                self.puntaje += 10
+                self.vel_bloque += self.cfg.bloque_vel_inc
+            elif tipo == ENEMIGO:
+                self.vidas -= 1
+                if self.vidas <= 0:
+                    self.juego_activo = False
 
-            # Colisión con jugador
-            obj_rect = pygame.Rect(obj.x - obj.radio, int(obj.y - obj.radio), obj.radio * 2, obj.radio * 2)
-            if jugador_rect.colliderect(obj_rect):
-                if obj.tipo == TipoObjeto.BLOQUE:
-                    self.puntaje += 10
-                    self.vel_bloque += self.cfg.bloque_vel_inc
-                    objetos_a_eliminar.append(i)
-                elif obj.tipo == TipoObjeto.ENEMIGO:
-                    self.vidas -= 1
-                    objetos_a_eliminar.append(i)
-                    if self.vidas <= 0:
-                        self.juego_activo = False
-            # Objeto cae sin ser tocado
-            elif obj.y > self.cfg.alto:
-                if obj.tipo == TipoObjeto.BLOQUE:
-                    self.vidas -= 1
-                    if self.vidas <= 0:
-                        self.juego_activo = False
-                elif obj.tipo == TipoObjeto.ENEMIGO:
-                    self.puntaje += 5  # Bonus por evitar enemigo
-                    self.vel_enemigo += self.cfg.enemigo_vel_inc
-                objetos_a_eliminar.append(i)
+        # Objeto cae sin ser tocado
+        for tipo in caidos:
+            if tipo == BLOQUE:
+                self.vidas -= 1
+                if self.vidas <= 0:
+                    self.juego_activo = False
+            elif tipo == ENEMIGO:
+                self.puntaje += 5  # Bonus por evitar enemigo
+                self.vel_enemigo += self.cfg.enemigo_vel_inc
+        if perfil is not None:
+            perfil.marca("puntaje")
 
-        # Eliminar objetos fuera de pantalla o colisionados
-        for i in sorted(objetos_a_eliminar, reverse=True):
-            del self.objetos[i]
+    def num_objetos(self) -> int:
+        """Cantidad de objetos en pantalla."""
+        return len(self.almacen)
+
+    def objetos_visibles(self) -> Iterator[Visible]:
+        """Recorre (x, y, tipo, radio) de cada objeto; tipo es el valor de TipoObjeto."""
+        return self.almacen.visibles()
+
+    def instantanea(self) -> InstantaneaJuego:
+        """Copia inmutable del estado actual; no comparte nada mutable con el juego."""
+        xs, ys, velocidades, tipos, radios = self.almacen.columnas()
+        return InstantaneaJuego(self.puntaje, self.vidas, self.juego_activo, self.jugador_x,
+                                xs, ys, velocidades, tipos, radios)
+
+    def estadisticas_pool(self) -> Dict[str, float]:
+        """Estadísticas del pool de Objeto (solo se usa con el almacén 'lista')."""
+        return self.pool_objetos.estadisticas()
 
     def obtener_estado(self) -> Tuple[int, int, bool]:
         """Devuelve puntaje, vidas y si el juego está activo."""
@@ -0,0 +1,169 @@
+"""
+Simulación en un hilo propio a ritmo fijo - módulo separado.
+SimulacionEnHilo avanza ControlJuego a `tps` ticks por segundo en un hilo
+daemon y, tras cada tick, publica una InstantaneaJuego inmutable en un
+BufferInstantaneas (la anterior y la actual). El hilo de render nunca toca
+ControlJuego: dibuja una VistaInterpolada entre las dos últimas instantáneas,
+así un frame lento no atrasa la lógica y el movimiento se ve suave aunque
+FPS y TPS no coincidan.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from almacen import Visible
+from estado import ControlJuego, InstantaneaJuego
+
+
+class BufferInstantaneas:
+    """
+    Doble búfer de instantáneas: (anterior, actual, instante de publicación).
+    Publicar reemplaza la tupla completa con una sola asignación, así el
+    lector siempre ve un par coherente sin necesitar un lock.
+    """
+
+    def __init__(self, inicial: InstantaneaJuego) -> None:
+        self._par = (inicial, inicial, time.perf_counter())
+
+    def publicar(self, nueva: InstantaneaJuego) -> None:
+        self._par = (self._par[1], nueva, time.perf_counter())
+
+    def leer(self) -> Tuple[InstantaneaJuego, InstantaneaJuego, float]:
+        return self._par
+
+
+class VistaInterpolada:
+    """
+    Estado a dibujar entre dos instantáneas, con la misma interfaz de lectura
+    que ControlJuego (jugador_x, juego_activo, obtener_estado, num_objetos,
+    objetos_visibles). alfa=0 muestra la anterior y alfa=1 la actual.
+    Con el juego terminado la lógica ya no mueve nada y se muestra la actual.
+    """
+
+    def __init__(self, anterior: InstantaneaJuego, actual: InstantaneaJuego, alfa: float) -> None:
+        self.anterior = anterior
+        self.actual = actual
+        self.alfa = alfa if actual.juego_activo else 1.0
+        self.juego_activo = actual.juego_activo
+        self.jugador_x = round(anterior.jugador_x + (actual.jugador_x - anterior.jugador_x) * self.alfa)
+
+    def obtener_estado(self) -> Tuple[int, int, bool]:
+        return self.actual.puntaje, self.actual.vidas, self.actual.juego_activo
+
+    def num_objetos(self) -> int:
+        return len(self.actual.xs)
+
+    def objetos_visibles(self) -> Iterator[Visible]:
+        # Los objetos se reordenan al quitar otros (swap-remove), así que no se
+        # emparejan entre instantáneas: se retrocede cada uno según su velocidad.
+        atraso = 1.0 - self.alfa
+        actual = self.actual
+        return ((x, y - vel * atraso, tipo, radio)
+                for x, y, vel, tipo, radio in zip(actual.xs, actual.ys, actual.velocidades, actual.tipos, actual.radios))
+
+
+class SimulacionEnHilo:
+    """
+    Hilo de lógica a ritmo fijo. Las entradas llegan del hilo de render por
+    `teclas` (izquierda, derecha) y pedir_reinicio(); solo este hilo llama a
+    `motor` (ControlJuego o un Grabador que lo envuelve).
+    Si se atrasa más de `max_pasos` ticks seguidos, descarta los que faltan
+    (el tiempo de juego se frena) en lugar de acumular atraso sin fin.
+    """
+
+    def __init__(self, motor=None, control: Optional[ControlJuego] = None,
+                 tps: int = 60, max_pasos: int = 5) -> None:
+        self.control = control or ControlJuego()
+        self.motor = motor or self.control
+        self.tps = tps
+        self.paso_s = 1 / tps
+        self.max_pasos = max_pasos
+        self.teclas: Tuple[bool, bool] = (False, False)
+        self.buffer = BufferInstantaneas(self.control.instantanea())
+        self.ticks = 0
+        self.descartados = 0
+        self.tps_medido = 0.0
+        self._ns_logica = 0
+        self._reinicio = threading.Event()
+        self._parar = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def pedir_reinicio(self) -> None:
+        """Reinicia la partida en el próximo tick."""
+        self._reinicio.set()
+
+    def iniciar(self) -> None:
+        self._parar.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="simulacion", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def _tick(self) -> None:
+        inicio = time.perf_counter_ns()
+        perfil = self.control.perfil
+        if perfil is not None:
+            perfil.empezar()
+        if self._reinicio.is_set():
+            self._reinicio.clear()
+            self.motor.reiniciar()
+        izquierda, derecha = self.teclas
+        velocidad = self.control.cfg.paddle_vel
+        if izquierda:
+            self.motor.mover_jugador(-velocidad)
+        if derecha:
+            self.motor.mover_jugador(velocidad)
+        if perfil is not None:
+            perfil.marca("entradas")
+        self.motor.actualizar(int(self.ticks * 1000 / self.tps))
+        self.buffer.publicar(self.control.instantanea())
+        if perfil is not None:
+            perfil.marca("instantanea")
+            perfil.terminar()
+        self.ticks += 1
+        self._ns_logica += time.perf_counter_ns() - inicio
+
+    def _bucle(self) -> None:
+        reloj = time.perf_counter
+        siguiente = reloj()
+        ventana, ticks_ventana = siguiente, self.ticks
+        while not self._parar.is_set():
+            espera = siguiente - reloj()
+            if espera > 0:
+                self._parar.wait(espera)
+                continue
+            pasos = 0
+            while reloj() >= siguiente and pasos < self.max_pasos:
+                self._tick()
+                siguiente += self.paso_s
+                pasos += 1
+            atraso = reloj() - siguiente
+            if atraso >= self.paso_s:
+                perdidos = int(atraso / self.paso_s)
+                self.descartados += perdidos
+                siguiente += perdidos * self.paso_s
+            ahora = reloj()
+            if ahora - ventana >= 1.0:
+                self.tps_medido = (self.ticks - ticks_ventana) / (ahora - ventana)
+                ventana, ticks_ventana = ahora, self.ticks
+
+    def vista(self) -> VistaInterpolada:
+        """Vista para dibujar ahora: interpola según el tiempo desde el último tick."""
+        anterior, actual, instante = self.buffer.leer()
+        alfa = min(1.0, (time.perf_counter() - instante) / self.paso_s)
+        return VistaInterpolada(anterior, actual, alfa)
+
+    def estadisticas(self) -> Dict[str, float]:
+        return {
+            "tps": self.tps_medido,
+            "ticks": self.ticks,
+            "descartados": self.descartados,
+            "ms_por_tick": self._ns_logica / self.ticks / 1e6 if self.ticks else 0.0,
+        }
@@ -2,12 +2,87 @@
 
 from __future__ import annotations
 
+import os
 import sys
-from typing import Tuple
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
 
 import pygame
 
-from estado import ControlJuego, TipoObjeto
+from estado import BLOQUE, ENEMIGO, ControlJuego
+from hilos import SimulacionEnHilo
+from perfil import Perfilador
+from repeticion import Grabador
+
+
+# ============================================================================
+# Caches de superficies
+# ============================================================================
+
+
+Color = Tuple[int, int, int]
+
+
+class CacheTextos:
+    """
+    Superficies de texto ya renderizadas, por (texto, fuente, color).
+    Desaloja la menos usada al superar `max_entradas`.
+    """
+
+    def __init__(self, fuentes: Dict[str, pygame.font.Font], max_entradas: int = 128) -> None:
+        self.fuentes = fuentes
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Tuple[str, str, Color], pygame.Surface]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, texto: str, fuente: str, color: Color) -> pygame.Surface:
+        clave = (texto, fuente, color)
+        superficie = self._entradas.get(clave)
+        if superficie is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+        self.fallos += 1
+        superficie = self.fuentes[fuente].render(texto, True, color)
+        self._entradas[clave] = superficie
+        if len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+        return superficie
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {"entradas": len(self._entradas), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+def _crear_sprite(tipo: int, radio: int, cfg) -> Tuple[pygame.Surface, int]:
+    """
+    Dibuja una vez un bloque o enemigo centrado en una superficie con alfa.
+    Devuelve (superficie, desplazamiento del centro).
+    """
+    margen = 3  # Los contornos se dibujan un poco por fuera del radio
+    centro = radio + margen
+    sprite = pygame.Surface((2 * centro + 1, 2 * centro + 1), pygame.SRCALPHA)
+    x = y = centro
+    if tipo == BLOQUE:
+        # Bloques: círculos naranjas con contorno blanco
+        pygame.draw.circle(sprite, cfg.color_bloque, (x, y), radio)
+        pygame.draw.circle(sprite, (255, 255, 255), (x, y), radio, 2)
+    else:  # ENEMIGO
+        # Enemigos: caras triangulares amenazantes rojas
+        puntos = [
+            (x, y - radio),          # arriba
+            (x - radio, y + radio),  # abajo izquierda
+            (x + radio, y + radio),  # abajo derecha
+        ]
+        pygame.draw.polygon(sprite, cfg.color_enemigo, puntos)
+        pygame.draw.polygon(sprite, (100, 0, 0), puntos, 3)  # Contorno oscuro
+
+        # Ojos
+        pygame.draw.circle(sprite, (255, 255, 255), (x - 5, y - 2), 3)
+        pygame.draw.circle(sprite, (255, 255, 255), (x + 5, y - 2), 3)
+        pygame.draw.circle(sprite, (0, 0, 0), (x - 5, y - 2), 2)
+        pygame.draw.circle(sprite, (0, 0, 0), (x + 5, y - 2), 2)
+    return sprite, centro
 
 
 # ============================================================================
@@ -21,16 +96,53 @@ class InterfazJuego:
     Responsabilidades: render, input, no tiene lógica de juego.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, render_parcial: bool = True, grabar: Optional[str] = None,
+                 hilos: bool = False, fps: int = 60, tps: int = 60, perfil: Optional[str] = None) -> None:
         pygame.init()
         self.control = ControlJuego()
         self.cfg = self.control.cfg
+        # Con `grabar`, las entradas pasan por un Grabador que se guarda al salir
+        self.ruta_grabacion = grabar
+        self.grabador = Grabador(self.control) if grabar else None
+        self.motor = self.grabador or self.control
+        # Con `hilos`, la lógica corre en su propio hilo a `tps` y se dibujan instantáneas
+        self.fps = fps
+        self.simulacion = SimulacionEnHilo(self.motor, self.control, tps) if hilos else None
+        self.vista = self.control  # Lo que se dibuja: el control o una VistaInterpolada
+        # Tiempos por fase de cada frame (y de cada tick de lógica); con `perfil` se exportan al salir
+        self.ruta_perfil = perfil
+        self.perfil = Perfilador(trazar=perfil is not None)
+        # ControlJuego es un Singleton: cerrar() le devuelve el perfilador que tenía
+        self._perfil_previo = self.control.perfil
+        self.control.perfil = Perfilador(total="tick", trazar=perfil is not None) if hilos else self.perfil
+        self.mostrar_perfil = False  # F3
+        self._lineas_perfil: Tuple[str, ...] = ()
+        self._panel_perfil: Optional[pygame.Surface] = None
         self.pantalla = pygame.display.set_mode((self.cfg.ancho, self.cfg.alto))
         pygame.display.set_caption("Atrapa Bloques Evita Enemigos - Singleton")
         self.reloj = pygame.time.Clock()
         self.fuente = pygame.font.SysFont("consolas", 22)
         self.fuente_grande = pygame.font.SysFont("consolas", 32, bold=True)
+        self.fuente_pequena = pygame.font.SysFont("consolas", 16)
+        self.textos = CacheTextos(
+            {"normal": self.fuente, "grande": self.fuente_grande, "pequena": self.fuente_pequena}
+        )
+        # Sprites prerenderizados por (tipo, radio) y overlay de GAME OVER persistente
+        self._sprites: Dict[Tuple[int, int], Tuple[pygame.Surface, int]] = {}
+        self._overlay = pygame.Surface((self.cfg.ancho, self.cfg.alto), pygame.SRCALPHA)
+        self._overlay.fill((0, 0, 0, 140))
         self.tiempo_inicio = pygame.time.get_ticks()
+        # Render por rectángulos sucios: regiones dibujadas en el frame anterior y el actual
+        self.render_parcial = render_parcial
+        self.area_actualizada = 0  # Píxeles enviados al display en el último frame
+        self._forzar_completo = True
+        self._activo_previo = True
+        self._firma_previa: Tuple[int, ...] = ()
+        self._area_previa = 0
+        self._moviles: List[pygame.Rect] = []
+        self._moviles_actual: List[pygame.Rect] = []
+        self._hud: Dict[Hashable, pygame.Rect] = {}
+        self._hud_actual: Dict[Hashable, pygame.Rect] = {}
 
     def _manejar_eventos(self) -> bool:
         """Procesa eventos de entrada. Devuelve False si se debe cerrar."""
@@ -41,121 +153,268 @@ class InterfazJuego:
                 if evento.key == pygame.K_ESCAPE:
                     return False
                 if evento.key == pygame.K_r:
-                    self.control.reiniciar()
+                    if self.simulacion is not None:
+                        self.simulacion.pedir_reinicio()
+                    else:
+                        self.motor.reiniciar()
                     self.tiempo_inicio = pygame.time.get_ticks()
+                    self._forzar_completo = True
+                if evento.key == pygame.K_F2:
+                    self.render_parcial = not self.render_parcial
+                    self._forzar_completo = True
+                if evento.key == pygame.K_F3:
+                    self.mostrar_perfil = not self.mostrar_perfil
+                    self._lineas_perfil = ()
+                    self._forzar_completo = True
 
         # Controles continuos
         teclas = pygame.key.get_pressed()
+        if self.simulacion is not None:
+            self.simulacion.teclas = (bool(teclas[pygame.K_LEFT]), bool(teclas[pygame.K_RIGHT]))
+            return True
         if teclas[pygame.K_LEFT]:
-            self.control.mover_jugador(-self.cfg.paddle_vel)
+            self.motor.mover_jugador(-self.cfg.paddle_vel)
         if teclas[pygame.K_RIGHT]:
-            self.control.mover_jugador(self.cfg.paddle_vel)
+            self.motor.mover_jugador(self.cfg.paddle_vel)
 
         return True
 
     def _dibujar_texto(self, texto: str, pos: Tuple[int, int], grande: bool = False) -> None:
         """Dibuja texto con sombra en la pantalla."""
-        fuente = self.fuente_grande if grande else self.fuente
-        sombra = fuente.render(texto, True, (0, 0, 0))
-        self.pantalla.blit(sombra, (pos[0] + 2, pos[1] + 2))
-        surf = fuente.render(texto, True, self.cfg.color_texto)
-        self.pantalla.blit(surf, pos)
+        fuente = "grande" if grande else "normal"
+        sombra = self.pantalla.blit(self.textos.obtener(texto, fuente, (0, 0, 0)), (pos[0] + 2, pos[1] + 2))
+        rect = self.pantalla.blit(self.textos.obtener(texto, fuente, self.cfg.color_texto), pos)
+        self._hud_actual[(texto, pos, grande)] = rect.union(sombra)
+
+    def _sprite(self, tipo: int, radio: int) -> Tuple[pygame.Surface, int]:
+        """Sprite del tipo y radio pedidos, creado en el primer uso."""
+        clave = (tipo, radio)
+        sprite = self._sprites.get(clave)
+        if sprite is None:
+            sprite = self._sprites[clave] = _crear_sprite(tipo, radio, self.cfg)
+        return sprite
 
     def _dibujar_objetos(self) -> None:
-        """Dibuja todos los objetos (bloques y enemigos)."""
-        for obj in self.control.objetos:
-            if obj.tipo == TipoObjeto.BLOQUE:
-                # Bloques: círculos naranjas con contorno blanco
-                pygame.draw.circle(
-                    self.pantalla,
-                    obj.color,
-                    (int(obj.x), int(obj.y)),
-                    obj.radio,
-                )
-                pygame.draw.circle(
-                    self.pantalla,
-                    (255, 255, 255),
-                    (int(obj.x), int(obj.y)),
-                    obj.radio,
-                    2,
-                )
-            else:  # ENEMIGO
-                # Enemigos: caras triangulares amenazantes rojas
-                radio = obj.radio
-                x, y = int(obj.x), int(obj.y)
-                
-                # Triángulo hacia abajo (cara amenazante)
-                puntos = [
-                    (x, y - radio),          # arriba
-                    (x - radio, y + radio),  # abajo izquierda
-                    (x + radio, y + radio),  # abajo derecha
-                ]
-                pygame.draw.polygon(self.pantalla, obj.color, puntos)
-                pygame.draw.polygon(self.pantalla, (100, 0, 0), puntos, 3)  # Contorno oscuro
-                
-                # Ojos
-                pygame.draw.circle(self.pantalla, (255, 255, 255), (x - 5, y - 2), 3)
-                pygame.draw.circle(self.pantalla, (255, 255, 255), (x + 5, y - 2), 3)
-                pygame.draw.circle(self.pantalla, (0, 0, 0), (x - 5, y - 2), 2)
-                pygame.draw.circle(self.pantalla, (0, 0, 0), (x + 5, y - 2), 2)
+        """Dibuja todos los objetos (bloques y enemigos) copiando sus sprites."""
+        sprites = {tipo: self._sprite(tipo, self.cfg.objeto_radio) for tipo in (BLOQUE, ENEMIGO)}
+        tandas = []
+        for obj_x, obj_y, tipo, radio in self.vista.objetos_visibles():
+            sprite, centro = sprites[tipo] if radio == self.cfg.objeto_radio else self._sprite(tipo, radio)
+            tandas.append((sprite, (int(obj_x) - centro, int(obj_y) - centro)))
+        rects = self.pantalla.blits(tandas, doreturn=self.render_parcial)
+        if rects:
+            self._moviles_actual.extend(rects)
 
     def _dibujar_jugador(self) -> None:
         """Dibuja la barra del jugador."""
-        pygame.draw.rect(
+        rect = pygame.draw.rect(
             self.pantalla,
             self.cfg.color_jugador,
-            (self.control.jugador_x, self.cfg.alto - 40, self.cfg.paddle_ancho, self.cfg.paddle_alto),
+            (self.vista.jugador_x, self.cfg.alto - 40, self.cfg.paddle_ancho, self.cfg.paddle_alto),
             border_radius=4,
         )
+        self._moviles_actual.append(rect)
+
+    def _segundos(self) -> int:
+        """Segundos desde el inicio de la partida."""
+        return (pygame.time.get_ticks() - self.tiempo_inicio) // 1000
+
+    def _firma_hud(self) -> Tuple[int, ...]:
+        """Valores de los que depende el HUD: si no cambian, tampoco cambia el texto."""
+        puntaje, vidas, _ = self.vista.obtener_estado()
+        if self.mostrar_perfil:
+            self._actualizar_lineas_perfil()
+        return (puntaje, vidas, self._segundos(), self.vista.num_objetos()) + self._ritmo() + self._lineas_perfil
+
+    def _ritmo(self) -> Tuple[int, ...]:
+        """(TPS, FPS) redondeados con la simulación en hilo; vacío en modo secuencial."""
+        if self.simulacion is None:
+            return ()
+        return round(self.simulacion.tps_medido), round(self.reloj.get_fps())
 
     def _dibujar_ui(self) -> None:
         """Dibuja información del juego (HUD)."""
-        puntaje, vidas, activo = self.control.obtener_estado()
-        tiempo_transcurrido = (pygame.time.get_ticks() - self.tiempo_inicio) // 1000
+        puntaje, vidas, activo = self.vista.obtener_estado()
+        tiempo_transcurrido = self._segundos()
         self._dibujar_texto(f"Puntaje: {puntaje}", (12, 12))
         self._dibujar_texto(f"Vidas: {vidas}", (12, 38))
         self._dibujar_texto(f"Tiempo: {tiempo_transcurrido}s", (12, 64))
-        self._dibujar_texto(f"Objetos: {len(self.control.objetos)}", (self.cfg.ancho - 200, 12))
+        self._dibujar_texto(f"Objetos: {self.vista.num_objetos()}", (self.cfg.ancho - 200, 12))
+        ritmo = self._ritmo()
+        if ritmo:
+            self._dibujar_texto(f"TPS: {ritmo[0]} | FPS: {ritmo[1]}", (self.cfg.ancho - 200, 38))
         self._dibujar_texto("Flechas mover | R reiniciar | ESC salir", (12, self.cfg.alto - 28))
 
     def _dibujar_overlays(self) -> None:
         """Dibuja overlays de estado (GAME OVER)."""
-        puntaje, vidas, activo = self.control.obtener_estado()
+        puntaje, vidas, activo = self.vista.obtener_estado()
         if not activo:
-            overlay = pygame.Surface((self.cfg.ancho, self.cfg.alto), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 140))
-            self.pantalla.blit(overlay, (0, 0))
+            self.pantalla.blit(self._overlay, (0, 0))
             self._dibujar_texto("GAME OVER", (self.cfg.ancho // 2 - 110, self.cfg.alto // 2 - 40), grande=True)
             self._dibujar_texto(f"Puntaje Final: {puntaje}", (self.cfg.ancho // 2 - 130, self.cfg.alto // 2), grande=False)
             self._dibujar_texto("R para reiniciar", (self.cfg.ancho // 2 - 100, self.cfg.alto // 2 + 40), grande=False)
 
     def _dibujar_leyenda(self) -> None:
         """Dibuja leyenda de colores."""
-        fuente_pequeña = pygame.font.SysFont("consolas", 16)
-        texto_bloque = fuente_pequeña.render("Naranja: +10pts", True, self.cfg.color_bloque)
-        texto_enemigo = fuente_pequeña.render("Rojo: -1vida", True, self.cfg.color_enemigo)
-        self.pantalla.blit(texto_bloque, (self.cfg.ancho - 200, self.cfg.alto - 50))
-        self.pantalla.blit(texto_enemigo, (self.cfg.ancho - 200, self.cfg.alto - 25))
+        texto_bloque = self.textos.obtener("Naranja: +10pts", "pequena", self.cfg.color_bloque)
+        texto_enemigo = self.textos.obtener("Rojo: -1vida", "pequena", self.cfg.color_enemigo)
+        self._hud_actual["leyenda_bloque"] = self.pantalla.blit(texto_bloque, (self.cfg.ancho - 200, self.cfg.alto - 50))
+        self._hud_actual["leyenda_enemigo"] = self.pantalla.blit(texto_enemigo, (self.cfg.ancho - 200, self.cfg.alto - 25))
 
-    def dibujar(self) -> None:
-        """Renderiza un frame completo."""
-        self.pantalla.fill(self.cfg.color_fondo)
+    def _actualizar_lineas_perfil(self) -> None:
+        """Recalcula el texto del overlay de perfil (p50/p99 por fase) cada medio segundo."""
+        if self._lineas_perfil and self.perfil.frames % 30:
+            return
+        lineas = [f"{'fase':<17}{'p50':>7}{'p99':>7} ms"]
+        perfiles = [self.perfil] if self.control.perfil is self.perfil else [self.perfil, self.control.perfil]
+        for perfil in perfiles:
+            estadisticas = perfil.estadisticas()
+            for fase in sorted(estadisticas, key=lambda f: f == perfil.total):  # El total al final
+                valores = estadisticas[fase]
+                lineas.append(f"{fase:<17}{valores['p50_ms']:>7.2f}{valores['p99_ms']:>7.2f}")
+        lineas.append(f"presupuesto {1000 / self.fps:.1f} ms/frame")
+        self._lineas_perfil = tuple(lineas)
+
+    def _dibujar_perfil(self) -> None:
+        """Dibuja el overlay de perfil (F3) sobre un panel semitransparente."""
+        if not self.mostrar_perfil:
+            return
+        alto_linea = self.fuente_pequena.get_linesize()
+        alto_panel = alto_linea * len(self._lineas_perfil) + 8
+        if self._panel_perfil is None or self._panel_perfil.get_height() != alto_panel:
+            self._panel_perfil = pygame.Surface((300, alto_panel), pygame.SRCALPHA)
+            self._panel_perfil.fill((0, 0, 0, 170))
+        self._hud_actual["perfil_panel"] = self.pantalla.blit(self._panel_perfil, (8, 92))
+        for i, linea in enumerate(self._lineas_perfil):
+            texto = self.textos.obtener(linea, "pequena", self.cfg.color_texto)
+            self._hud_actual[("perfil", i, linea)] = self.pantalla.blit(texto, (12, 96 + i * alto_linea))
+
+    def _dibujar_escena(self) -> None:
+        """Dibuja todos los elementos, anota los rectángulos que ocupan y mide cada fase."""
+        self._moviles_actual = []
+        self._hud_actual = {}
+        perfil = self.perfil
         self._dibujar_objetos()
+        perfil.marca("dibujar_objetos")
         self._dibujar_jugador()
+        perfil.marca("dibujar_jugador")
         self._dibujar_ui()
+        perfil.marca("dibujar_ui")
         self._dibujar_leyenda()
+        perfil.marca("dibujar_leyenda")
         self._dibujar_overlays()
+        perfil.marca("dibujar_overlays")
+        self._dibujar_perfil()
+        perfil.marca("dibujar_perfil")
+
+    def _dibujar_completo(self) -> None:
+        """Limpia toda la pantalla, dibuja la escena y hace flip."""
+        self.pantalla.fill(self.cfg.color_fondo)
+        self.perfil.marca("limpiar")
+        self._dibujar_escena()
         pygame.display.flip()
+        self.perfil.marca("display")
+        self.area_actualizada = self.cfg.ancho * self.cfg.alto
+
+    def _dibujar_parcial(self) -> None:
+        """
+        Borra lo dibujado en el frame anterior, dibuja la escena y envía al display
+        solo los objetos y la barra (posición vieja y nueva) y los textos que cambiaron.
+        """
+        fondo = self.cfg.color_fondo
+        for rect in self._moviles:
+            self.pantalla.fill(fondo, rect)
+        for rect in self._hud.values():
+            self.pantalla.fill(fondo, rect)
+        self.perfil.marca("limpiar")
+        self._dibujar_escena()
+
+        sucios = self._moviles + self._moviles_actual
+        sucios += [rect for clave, rect in self._hud_actual.items() if clave not in self._hud]
+        sucios += [rect for clave, rect in self._hud.items() if clave not in self._hud_actual]
+        area = sum(rect.width * rect.height for rect in sucios)
+        total = self.cfg.ancho * self.cfg.alto
+        if area * 2 > total:
+            pygame.display.flip()
+            area = total
+        else:
+            pygame.display.update(sucios)
+        self.perfil.marca("display")
+        self.area_actualizada = area
+
+    def dibujar(self) -> None:
+        """
+        Renderiza un frame completo o, con render_parcial, solo las regiones que cambiaron.
+        Si se espera más de media pantalla sucia se dibuja completo: un fill y un flip
+        salen más baratos que cientos de rectángulos.
+        Con la simulación en hilo se dibuja la instantánea interpolada de este momento.
+        """
+        if self.simulacion is not None:
+            self.vista = self.simulacion.vista()
+        activo = self.vista.juego_activo
+        firma = self._firma_hud()
+        parcial = self.render_parcial and not self._forzar_completo and activo == self._activo_previo
+        if parcial and not activo and firma == self._firma_previa:
+            self.area_actualizada = 0  # GAME OVER sin cambios: la pantalla ya está al día
+            return
+        if parcial and activo and self._area_previa * 2 <= self.cfg.ancho * self.cfg.alto:
+            self._dibujar_parcial()
+        else:
+            self._dibujar_completo()
+        self._forzar_completo = False
+        self._activo_previo = activo
+        self._firma_previa = firma
+        self._moviles = self._moviles_actual
+        self._hud = self._hud_actual
+        # Estimación del área sucia del próximo frame: posiciones viejas + nuevas
+        self._area_previa = 2 * sum(rect.width * rect.height for rect in self._moviles)
 
     def ejecutar(self) -> None:
-        """Bucle principal de la interfaz."""
+        """
+        Bucle principal de la interfaz. En modo secuencial cada frame procesa
+        entradas, actualiza y dibuja; con la simulación en hilo solo entradas y render.
+        Cada fase queda medida en self.perfil ("espera" es lo que sobra del frame).
+        """
         corriendo = True
+        perfil = self.perfil
+        if self.simulacion is not None:
+            self.simulacion.iniciar()
         while corriendo:
+            perfil.empezar()
             corriendo = self._manejar_eventos()
-            tiempo_actual = pygame.time.get_ticks()
-            self.control.actualizar(tiempo_actual)
+            perfil.marca("eventos")
+            if self.simulacion is None:
+                tiempo_actual = pygame.time.get_ticks()
+                self.motor.actualizar(tiempo_actual)
             self.dibujar()
-            self.reloj.tick(60)
+            self.reloj.tick(self.fps)
+            perfil.marca("espera")
+            perfil.terminar()
+
+        if self.simulacion is not None:
+            self.simulacion.detener()
+        if self.ruta_perfil:
+            self._exportar_perfil()
+        self.cerrar()
 
+        if self.grabador is not None:
+            tamano = self.grabador.guardar(self.ruta_grabacion)
+            print(f"Partida grabada en {self.ruta_grabacion} ({tamano} bytes, {self.grabador.ticks} ticks)")
         pygame.quit()
         sys.exit()
+
+    def cerrar(self) -> None:
+        """Detiene la simulación en hilo y devuelve a ControlJuego el perfilador que tenía antes."""
+        if self.simulacion is not None:
+            self.simulacion.detener()
+        self.control.perfil = self._perfil_previo
+
+    def _exportar_perfil(self) -> None:
+        """Guarda la traza del render y, con la simulación en hilo, la de la lógica al lado."""
+        frames = self.perfil.exportar(self.ruta_perfil)
+        print(f"Perfil guardado en {self.ruta_perfil} ({frames} frames)")
+        if self.control.perfil is not self.perfil:
+            base, extension = os.path.splitext(self.ruta_perfil)
+            ruta = f"{base}_logica{extension}"
+            ticks = self.control.perfil.exportar(ruta)
+            print(f"Perfil de la lógica guardado en {ruta} ({ticks} ticks)")
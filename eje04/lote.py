@@ -0,0 +1,172 @@
+"""
+Ejecución en lote de partidas sin ventana - módulo separado.
+ControlJuego es un Singleton por proceso, así que cada trabajador de un
+ProcessPoolExecutor tiene su propia instancia y juega sus partidas en serie.
+Agrega la distribución de puntajes y de tiempo de supervivencia, permite
+barrer un parámetro de Ajustes (p. ej. bloque_vel_inc o freq_enemigo) y
+mide partidas por segundo según la cantidad de procesos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from estado import Ajustes
+from simulacion import CONTROLADORES, Simulador
+
+# (semilla, puntaje, ticks sobrevividos)
+Partida = Tuple[int, int, int]
+
+_simulador: Optional[Simulador] = None  # Uno por proceso trabajador
+
+
+def _jugar_tanda(semillas: Sequence[int], cambios: Dict[str, Any], ticks: int,
+                 controlador: str, paso_ms: float) -> List[Partida]:
+    """Juega varias partidas seguidas con el ControlJuego de este proceso."""
+    global _simulador
+    if _simulador is None or _simulador.paso_ms != paso_ms:
+        _simulador = Simulador(paso_ms)
+    _simulador.control.configurar(dataclasses.replace(Ajustes(), **cambios))
+    bot = CONTROLADORES[controlador]()
+    partidas: List[Partida] = []
+    for semilla in semillas:
+        resultado = _simulador.ejecutar(ticks, bot, semilla)
+        partidas.append((semilla, resultado.puntaje, resultado.ticks))
+    return partidas
+
+
+def ejecutar_lote(partidas: int, cambios: Optional[Dict[str, Any]] = None, procesos: int = 1,
+                  ticks: int = 36_000, controlador: str = "bot", semilla_base: int = 0,
+                  tam_tanda: int = 25, paso_ms: float = 1000 / 60) -> Tuple[List[Partida], float]:
+    """
+    Juega `partidas` partidas con semillas semilla_base.. repartidas en tandas.
+    Devuelve (resultados ordenados por semilla, duración en s).
+    """
+    cambios = cambios or {}
+    semillas = list(range(semilla_base, semilla_base + partidas))
+    tandas = [semillas[i:i + tam_tanda] for i in range(0, len(semillas), tam_tanda)]
+    inicio = time.perf_counter()
+    if procesos <= 1:
+        resultados = [p for tanda in tandas for p in _jugar_tanda(tanda, cambios, ticks, controlador, paso_ms)]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_jugar_tanda, tanda, cambios, ticks, controlador, paso_ms) for tanda in tandas]
+            resultados = [p for futuro in futuros for p in futuro.result()]
+    return sorted(resultados), time.perf_counter() - inicio
+
+
+def resumir(resultados: Sequence[Partida], paso_ms: float = 1000 / 60) -> Dict[str, float]:
+    """Media, desviación y percentiles de puntaje y supervivencia (s)."""
+    resumen: Dict[str, float] = {"partidas": len(resultados)}
+    puntajes = [puntaje for _, puntaje, _ in resultados]
+    supervivencia = [ticks * paso_ms / 1000 for _, _, ticks in resultados]
+    for nombre, valores in (("puntaje", puntajes), ("supervivencia_s", supervivencia)):
+        if len(valores) >= 2:
+            p10, p50, p90 = (statistics.quantiles(valores, n=10)[i] for i in (0, 4, 8))
+        else:
+            p10 = p50 = p90 = valores[0] if valores else 0.0
+        resumen.update({
+            f"{nombre}_media": statistics.fmean(valores) if valores else 0.0,
+            f"{nombre}_desv": statistics.pstdev(valores) if valores else 0.0,
+            f"{nombre}_min": min(valores, default=0.0),
+            f"{nombre}_p10": p10,
+            f"{nombre}_p50": p50,
+            f"{nombre}_p90": p90,
+            f"{nombre}_max": max(valores, default=0.0),
+        })
+    return resumen
+
+
+def escalar(partidas: int, procesos: Sequence[int], **opciones: Any) -> List[Dict[str, float]]:
+    """Partidas por segundo y aceleración para cada cantidad de procesos."""
+    filas: List[Dict[str, float]] = []
+    base: Optional[float] = None
+    for n in procesos:
+        _, duracion = ejecutar_lote(partidas, procesos=n, **opciones)
+        por_segundo = partidas / duracion
+        base = base or por_segundo
+        filas.append({"procesos": n, "partidas_s": por_segundo, "aceleracion": por_segundo / base})
+    return filas
+
+
+def _convertir(campo: str, texto: str) -> Any:
+    """Convierte `texto` al tipo del campo de Ajustes."""
+    campos = {f.name: f for f in dataclasses.fields(Ajustes)}
+    if campo not in campos:
+        raise ValueError(f"Ajustes no tiene el campo {campo!r}")
+    actual = getattr(Ajustes(), campo)
+    return type(actual)(texto) if isinstance(actual, (int, float, str)) else json.loads(texto)
+
+
+def _leer_asignaciones(asignaciones: Sequence[str]) -> Dict[str, Any]:
+    cambios: Dict[str, Any] = {}
+    for asignacion in asignaciones:
+        campo, _, valor = asignacion.partition("=")
+        cambios[campo] = _convertir(campo, valor)
+    return cambios
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--partidas", type=int, default=200)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--ticks", type=int, default=36_000, help="Tope de ticks por partida")
+    parser.add_argument("--controlador", choices=list(CONTROLADORES), default="bot")
+    parser.add_argument("--semilla-base", type=int, default=0)
+    parser.add_argument("--tam-tanda", type=int, default=25, help="Partidas por envío al pool")
+    parser.add_argument("--ajuste", action="append", default=[], metavar="CAMPO=VALOR",
+                        help="Sobrescribe un campo de Ajustes (repetible)")
+    parser.add_argument("--barrer", metavar="CAMPO=V1,V2,...",
+                        help="Repite el lote para cada valor de un campo de Ajustes")
+    parser.add_argument("--escalado", nargs="*", type=int, metavar="N",
+                        help="Mide partidas/s con estas cantidades de procesos (por defecto 1,2,4..cpu)")
+    parser.add_argument("--json", dest="salida_json", help="Guarda los resúmenes en un archivo JSON")
+    args = parser.parse_args()
+
+    opciones = {"ticks": args.ticks, "controlador": args.controlador,
+                "semilla_base": args.semilla_base, "tam_tanda": args.tam_tanda}
+    cambios = _leer_asignaciones(args.ajuste)
+    variantes: List[Dict[str, Any]] = [cambios]
+    if args.barrer:
+        campo, _, valores = args.barrer.partition("=")
+        variantes = [{**cambios, campo: _convertir(campo, v)} for v in valores.split(",")]
+
+    informe: Dict[str, Any] = {"variantes": []}
+    print("=" * 100)
+    print(f"LOTE: {args.partidas} partidas x {len(variantes)} variante(s) | {args.procesos} procesos")
+    print("=" * 100)
+    print(f"{'ajustes':<34} {'part/s':>8} {'puntaje media':>14} {'p10/p50/p90':>16} "
+          f"{'superv. media (s)':>18} {'p10/p50/p90 (s)':>18}")
+    for variante in variantes:
+        resultados, duracion = ejecutar_lote(args.partidas, variante, args.procesos, **opciones)
+        resumen = resumir(resultados)
+        resumen["partidas_s"] = args.partidas / duracion
+        informe["variantes"].append({"ajustes": variante, "resumen": resumen})
+        etiqueta = ", ".join(f"{k}={v}" for k, v in variante.items()) or "(por defecto)"
+        puntajes = "/".join(f"{resumen[f'puntaje_p{p}']:.0f}" for p in (10, 50, 90))
+        supervivencia = "/".join(f"{resumen[f'supervivencia_s_p{p}']:.1f}" for p in (10, 50, 90))
+        print(f"{etiqueta:<34} {resumen['partidas_s']:>8.1f} {resumen['puntaje_media']:>14.1f} {puntajes:>16} "
+              f"{resumen['supervivencia_s_media']:>18.1f} {supervivencia:>18}")
+
+    if args.escalado is not None:
+        cpus = os.cpu_count() or 1
+        procesos = args.escalado or sorted({1, *[2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus], cpus})
+        print("\nEscalado por cantidad de procesos:")
+        informe["escalado"] = escalar(args.partidas, procesos, cambios=cambios, **opciones)
+        for fila in informe["escalado"]:
+            print(f"  procesos={fila['procesos']:>3} | {fila['partidas_s']:>8.1f} partidas/s | x{fila['aceleracion']:.2f}")
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
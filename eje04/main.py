@@ -5,8 +5,14 @@ Demuestra el uso del patrón Singleton en una aplicación gráfica interactiva.
 Módulos:
   - estado.py: Contiene ControlJuego (Singleton) con lógica de juego
   - interfaz.py: Contiene InterfazJuego con renderización y eventos
+
+Con --grabar ruta la partida se guarda para repetirla con repeticion.py.
+Con --hilos la lógica corre en su propio hilo a --tps ticks por segundo.
+Con --perfil ruta.csv (o .json) se guardan al salir los tiempos por fase de cada frame.
 """
 
+import argparse
+
 from estado import ControlJuego
 from interfaz import InterfazJuego
 
@@ -27,6 +33,13 @@ def demostrar_singleton() -> None:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atrapa Bloques Evita Enemigos")
+    parser.add_argument("--grabar", metavar="RUTA", help="Graba las entradas de la partida en RUTA")
+    parser.add_argument("--hilos", action="store_true", help="Simulación en un hilo propio, render interpolado")
+    parser.add_argument("--tps", type=int, default=60, help="Ticks de lógica por segundo (con --hilos)")
+    parser.add_argument("--fps", type=int, default=60, help="Tope de frames por segundo")
+    parser.add_argument("--perfil", metavar="RUTA", help="Exporta los tiempos por fase a RUTA (.csv o .json)")
+    args = parser.parse_args()
     demostrar_singleton()
-    InterfazJuego().ejecutar()
+    InterfazJuego(grabar=args.grabar, hilos=args.hilos, fps=args.fps, tps=args.tps, perfil=args.perfil).ejecutar()
 
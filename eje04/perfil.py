@@ -0,0 +1,98 @@
+"""
+Perfilado por frame - módulo separado.
+Perfilador toma tiempos con perf_counter_ns como vueltas de cronómetro:
+empezar() marca el inicio del frame y cada marca(fase) registra el tiempo
+desde la marca anterior, así las fases de un frame suman su duración total.
+Guarda una ventana móvil por fase para p50/p99 y, opcionalmente, una traza
+por frame que se exporta a CSV o JSON.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List
+
+
+class Perfilador:
+    """
+    Tiempos por fase con ventana móvil de `ventana` muestras.
+    `total` es el nombre de la fase que acumula el frame completo ("frame" o "tick").
+    Con `trazar=True` guarda una fila por frame (hasta `max_traza` filas).
+    """
+
+    def __init__(self, ventana: int = 240, total: str = "frame", trazar: bool = False,
+                 max_traza: int = 100_000) -> None:
+        self.ventana = ventana
+        self.total = total
+        self.trazar = trazar
+        self.frames = 0
+        self._muestras: Dict[str, Deque[int]] = {}
+        self._traza: Deque[Dict[str, int]] = deque(maxlen=max_traza)
+        self._fila: Dict[str, int] = {}
+        self._inicio = 0
+        self._ultima = 0
+
+    def empezar(self) -> None:
+        """Marca el inicio de un frame (o reanuda el cronómetro sin registrar nada)."""
+        self._inicio = self._ultima = time.perf_counter_ns()
+        self._fila = {}
+
+    def marca(self, fase: str) -> None:
+        """Registra en `fase` el tiempo desde la marca anterior."""
+        ahora = time.perf_counter_ns()
+        self._fila[fase] = self._fila.get(fase, 0) + ahora - self._ultima
+        self._ultima = ahora
+
+    def terminar(self) -> None:
+        """Cierra el frame: pasa sus fases a las ventanas y, si se traza, a la traza."""
+        fila = self._fila
+        fila[self.total] = self._ultima - self._inicio
+        for fase, ns in fila.items():
+            muestras = self._muestras.get(fase)
+            if muestras is None:
+                muestras = self._muestras[fase] = deque(maxlen=self.ventana)
+            muestras.append(ns)
+        if self.trazar:
+            self._traza.append(fila)
+        self._fila = {}
+        self.frames += 1
+
+    def estadisticas(self) -> Dict[str, Dict[str, float]]:
+        """p50, p99, media y máximo en ms de cada fase dentro de la ventana."""
+        resultado: Dict[str, Dict[str, float]] = {}
+        for fase, muestras in list(self._muestras.items()):  # Copia: otro hilo puede agregar fases
+            orden = sorted(muestras)
+            n = len(orden)
+            resultado[fase] = {
+                "p50_ms": orden[n // 2] / 1e6,
+                "p99_ms": orden[min(n - 1, n * 99 // 100)] / 1e6,
+                "media_ms": sum(orden) / n / 1e6,
+                "max_ms": orden[-1] / 1e6,
+            }
+        return resultado
+
+    def fases(self) -> List[str]:
+        return list(self._muestras)
+
+    def exportar(self, ruta: str) -> int:
+        """
+        Escribe la traza en `ruta`: CSV (una fila por frame, una columna por
+        fase, en ns) si termina en .csv, y si no JSON con el resumen y los frames.
+        Devuelve la cantidad de frames escritos.
+        """
+        columnas = ["indice"] + self.fases()
+        if ruta.endswith(".csv"):
+            with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+                escritor = csv.DictWriter(archivo, fieldnames=columnas, restval=0)
+                escritor.writeheader()
+                for i, fila in enumerate(self._traza):
+                    escritor.writerow({"indice": i, **fila})
+        else:
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump({"unidad": "ns", "resumen_ms": self.estadisticas(), "frames": list(self._traza)},
+                          archivo, indent=1)
+        return len(self._traza)
+
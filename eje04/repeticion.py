@@ -0,0 +1,207 @@
+"""
+Grabación y repetición determinista de partidas - módulo separado.
+Grabador envuelve a ControlJuego con sus mismos métodos (reiniciar,
+mover_jugador, actualizar) y guarda la semilla, los ajustes y cada entrada en
+un registro binario compacto. reproducir() vuelve a ejecutar ese registro sin
+ventana, a máxima velocidad, mide el tiempo de cada tick y verifica que el
+obtener_estado() final coincida con el grabado.
+
+Formato (little-endian):
+  cabecera: b"EJ4R", versión (B), semilla (q), largo (H) + Ajustes en JSON
+  eventos:  REINICIO (B) + semilla (q)
+            MOVIMIENTO (B) + dx (h)
+            TICK (B) + ms desde el tick anterior (H; 0xFFFF + q con signo si no entra o es negativo)
+            FIN (B) + ticks (I) + puntaje (q) + vidas (q) + activo (B)
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import random
+import struct
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from estado import Ajustes, ControlJuego
+
+MAGIA = b"EJ4R"
+VERSION = 2  # 2: delta largo con signo (q); la 1 lo guardaba sin signo y perdía los negativos
+REINICIO, MOVIMIENTO, TICK, FIN = range(4)
+
+_CABECERA = struct.Struct("<4sBqH")
+_TIPO = struct.Struct("<B")
+_SEMILLA = struct.Struct("<q")
+_DX = struct.Struct("<h")
+_DELTA = struct.Struct("<H")
+_DELTA_LARGO = struct.Struct("<q")
+_FIN = struct.Struct("<Iqq?")
+
+
+def _nueva_semilla() -> int:
+    return random.getrandbits(63)
+
+
+class Grabador:
+    """
+    Intermediario de grabación: se usa en lugar de ControlJuego para las
+    entradas y registra cada llamada antes de delegarla.
+    """
+
+    def __init__(self, control: Optional[ControlJuego] = None, semilla: Optional[int] = None) -> None:
+        self.control = control or ControlJuego()
+        self.semilla = _nueva_semilla() if semilla is None else semilla
+        self.ticks = 0
+        self._ultimo_tiempo = 0
+        ajustes = json.dumps(dataclasses.asdict(self.control.cfg)).encode("utf-8")
+        self._datos = bytearray(_CABECERA.pack(MAGIA, VERSION, self.semilla, len(ajustes)))
+        self._datos += ajustes
+        self.control.reiniciar(self.semilla)
+
+    def reiniciar(self, semilla: Optional[int] = None) -> None:
+        """Reinicia con una semilla (nueva si no se indica) y la registra."""
+        semilla = _nueva_semilla() if semilla is None else semilla
+        self._datos += _TIPO.pack(REINICIO) + _SEMILLA.pack(semilla)
+        self.control.reiniciar(semilla)
+
+    def mover_jugador(self, dx: int) -> None:
+        self._datos += _TIPO.pack(MOVIMIENTO) + _DX.pack(dx)
+        self.control.mover_jugador(dx)
+
+    def actualizar(self, tiempo_actual: int) -> None:
+        delta = tiempo_actual - self._ultimo_tiempo
+        if not 0 <= delta < 0xFFFF:
+            self._datos += _TIPO.pack(TICK) + _DELTA.pack(0xFFFF) + _DELTA_LARGO.pack(delta)
+        else:
+            self._datos += _TIPO.pack(TICK) + _DELTA.pack(delta)
+        self._ultimo_tiempo = tiempo_actual
+        self.ticks += 1
+        self.control.actualizar(tiempo_actual)
+
+    def __getattr__(self, nombre: str):
+        # El resto de la interfaz (obtener_estado, objetos_visibles...) va directo al control
+        return getattr(self.control, nombre)
+
+    def datos(self) -> bytes:
+        """Registro completo, con el estado final actual como pie."""
+        puntaje, vidas, activo = self.control.obtener_estado()
+        return bytes(self._datos) + _TIPO.pack(FIN) + _FIN.pack(self.ticks, puntaje, vidas, activo)
+
+    def guardar(self, ruta: str) -> int:
+        """Escribe el registro en `ruta` y devuelve su tamaño en bytes."""
+        datos = self.datos()
+        with open(ruta, "wb") as archivo:
+            archivo.write(datos)
+        return len(datos)
+
+
+@dataclass
+class ResultadoRepeticion:
+    """Resultado de volver a ejecutar un registro."""
+    ticks: int
+    duracion_s: float
+    ns_por_tick: float
+    estado_final: Tuple[int, int, bool]
+    estado_esperado: Tuple[int, int, bool]
+    coincide: bool
+    peores_ticks: List[Tuple[int, int]]  # (índice de tick, ns)
+
+
+def reproducir(registro: Union[str, bytes], control: Optional[ControlJuego] = None,
+               verificar: bool = True, peores: int = 0) -> ResultadoRepeticion:
+    """
+    Ejecuta un registro (ruta o bytes) sin ventana y a máxima velocidad.
+    Con verificar=True lanza RuntimeError si el estado final no coincide.
+    peores: cantidad de ticks más lentos a informar.
+    """
+    if isinstance(registro, str):
+        with open(registro, "rb") as archivo:
+            registro = archivo.read()
+    datos = memoryview(registro)
+    magia, version, semilla, largo = _CABECERA.unpack_from(datos, 0)
+    if magia != MAGIA or version != VERSION:
+        raise ValueError("No es un registro de partida válido (o es de otra versión)")
+    pos = _CABECERA.size
+    ajustes = Ajustes(**{
+        clave: tuple(valor) if isinstance(valor, list) else valor
+        for clave, valor in json.loads(bytes(datos[pos:pos + largo])).items()
+    })
+    pos += largo
+
+    control = control or ControlJuego()
+    control.configurar(ajustes, semilla)
+    reloj = time.perf_counter_ns
+    tiempos: List[int] = []
+    tiempo = 0
+    esperado: Optional[Tuple[int, int, bool]] = None
+    ticks_esperados = 0
+    inicio = time.perf_counter()
+    while pos < len(datos):
+        tipo = datos[pos]
+        pos += 1
+        if tipo == TICK:
+            (delta,) = _DELTA.unpack_from(datos, pos)
+            pos += _DELTA.size
+            if delta == 0xFFFF:
+                (delta,) = _DELTA_LARGO.unpack_from(datos, pos)
+                pos += _DELTA_LARGO.size
+            tiempo += delta
+            t0 = reloj()
+            control.actualizar(tiempo)
+            tiempos.append(reloj() - t0)
+        elif tipo == MOVIMIENTO:
+            (dx,) = _DX.unpack_from(datos, pos)
+            pos += _DX.size
+            control.mover_jugador(dx)
+        elif tipo == REINICIO:
+            (nueva,) = _SEMILLA.unpack_from(datos, pos)
+            pos += _SEMILLA.size
+            control.reiniciar(nueva)
+        elif tipo == FIN:
+            ticks_esperados, puntaje, vidas, activo = _FIN.unpack_from(datos, pos)
+            esperado = (puntaje, vidas, activo)
+            break
+        else:
+            raise ValueError(f"Evento desconocido {tipo} en el byte {pos - 1}")
+    duracion = time.perf_counter() - inicio
+    if esperado is None:
+        raise ValueError("Registro incompleto: falta el pie con el estado final")
+
+    final = control.obtener_estado()
+    coincide = final == esperado and len(tiempos) == ticks_esperados
+    if verificar and not coincide:
+        raise RuntimeError(f"La repetición divergió: se obtuvo {final} en {len(tiempos)} ticks, "
+                           f"se esperaba {esperado} en {ticks_esperados}")
+    lentos = sorted(enumerate(tiempos), key=lambda par: par[1], reverse=True)[:peores]
+    return ResultadoRepeticion(
+        ticks=len(tiempos),
+        duracion_s=duracion,
+        ns_por_tick=sum(tiempos) / len(tiempos) if tiempos else 0.0,
+        estado_final=final,
+        estado_esperado=esperado,
+        coincide=coincide,
+        peores_ticks=lentos,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("registro", help="Archivo grabado con main.py --grabar")
+    parser.add_argument("--peores", type=int, default=5, help="Cantidad de ticks más lentos a mostrar")
+    parser.add_argument("--sin-verificar", action="store_true", help="No fallar si el estado final difiere")
+    args = parser.parse_args()
+    resultado = reproducir(args.registro, verificar=not args.sin_verificar, peores=args.peores)
+    print("=" * 60)
+    print("REPETICION")
+    print("=" * 60)
+    print(f"Ticks: {resultado.ticks} | {resultado.duracion_s:.3f}s | {resultado.ns_por_tick:,.0f} ns/tick")
+    print(f"Estado final: {resultado.estado_final} | esperado: {resultado.estado_esperado} | "
+          f"{'✓ coincide' if resultado.coincide else '✗ divergió'}")
+    for indice, ns in resultado.peores_ticks:
+        print(f"  tick {indice:>7}: {ns / 1000:,.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Simulación sin ventana de ControlJuego - módulo separado.
+Avanza la lógica con un paso de tiempo fijo y una semilla, sin pygame ni
+display, tan rápido como se pueda (o a un múltiplo del tiempo real). La barra
+la mueve un controlador: un bot que persigue bloques o un guion de movimientos.
+Sirve para pruebas de carga/soak y para medir el costo de la lógica por tick.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from estado import BLOQUE, Ajustes, AlmacenLista, ControlJuego
+
+
+# ============================================================================
+# Controladores de la barra
+# ============================================================================
+
+
+class Controlador(ABC):
+    """Decide el desplazamiento de la barra en cada tick."""
+
+    @abstractmethod
+    def decidir(self, control: ControlJuego, tick: int) -> int:
+        """Desplazamiento de la barra para el tick `tick`."""
+
+
+class ControladorQuieto(Controlador):
+    """No mueve la barra: mide la lógica pura."""
+
+    def decidir(self, control: ControlJuego, tick: int) -> int:
+        return 0
+
+
+class ControladorGuion(Controlador):
+    """Reproduce una secuencia fija de desplazamientos (en bucle si repetir=True)."""
+
+    def __init__(self, movimientos: Sequence[int], repetir: bool = True) -> None:
+        if not movimientos:
+            raise ValueError("El guion necesita al menos un movimiento")
+        self.movimientos = list(movimientos)
+        self.repetir = repetir
+
+    def decidir(self, control: ControlJuego, tick: int) -> int:
+        if tick < len(self.movimientos):
+            return self.movimientos[tick]
+        return self.movimientos[tick % len(self.movimientos)] if self.repetir else 0
+
+
+class ControladorBot(Controlador):
+    """Persigue el bloque más bajo que todavía está sobre la barra."""
+
+    def decidir(self, control: ControlJuego, tick: int) -> int:
+        cfg = control.cfg
+        limite = cfg.alto - 40
+        objetivo: Optional[int] = None
+        mas_bajo = float("-inf")
+        for x, y, tipo, _ in control.objetos_visibles():
+            if tipo == BLOQUE and mas_bajo < y < limite:
+                objetivo, mas_bajo = x, y
+        if objetivo is None:
+            return 0
+        diferencia = objetivo - (control.jugador_x + cfg.paddle_ancho // 2)
+        return max(-cfg.paddle_vel, min(cfg.paddle_vel, diferencia))
+
+
+CONTROLADORES = {
+    "bot": ControladorBot,
+    "quieto": ControladorQuieto,
+}
+
+
+# ============================================================================
+# Medición de pausas del recolector de basura
+# ============================================================================
+
+
+class MedidorGC:
+    """Registra cada colección de gc (generación y duración) mientras está activo."""
+
+    def __init__(self) -> None:
+        self.pausas: List[float] = []  # Segundos
+        self.por_generacion = [0, 0, 0]
+        self._inicio = 0.0
+
+    def _callback(self, fase: str, info: Dict[str, Any]) -> None:
+        if fase == "start":
+            self._inicio = time.perf_counter()
+        else:
+            self.pausas.append(time.perf_counter() - self._inicio)
+            self.por_generacion[info["generation"]] += 1
+
+    def __enter__(self) -> "MedidorGC":
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        gc.callbacks.remove(self._callback)
+
+
+# ============================================================================
+# Motor de paso fijo
+# ============================================================================
+
+
+@dataclass
+class ResultadoSimulacion:
+    """Resumen de una corrida sin ventana."""
+    ticks: int
+    tiempo_simulado_s: float
+    duracion_s: float
+    ns_por_tick: float  # Solo ControlJuego.actualizar y mover_jugador
+    veces_tiempo_real: float
+    puntaje: int
+    vidas: int
+    juego_activo: bool
+    max_objetos: int
+    gc_colecciones: int
+    gc_por_generacion: List[int]
+    gc_pausa_total_ms: float
+    gc_pausa_max_ms: float
+
+
+class Simulador:
+    """
+    Avanza ControlJuego con ticks de `paso_ms` milisegundos simulados.
+    factor_tiempo: None corre lo más rápido posible; 1.0 respeta el tiempo real.
+    """
+
+    def __init__(self, paso_ms: float = 1000 / 60, ajustes: Optional[Ajustes] = None,
+                 factor_tiempo: Optional[float] = None) -> None:
+        if paso_ms <= 0:
+            raise ValueError("paso_ms debe ser > 0")
+        self.paso_ms = paso_ms
+        self.factor_tiempo = factor_tiempo
+        self.control = ControlJuego()
+        if ajustes is not None:
+            self.control.configurar(ajustes)
+
+    def ejecutar(self, ticks: int, controlador: Optional[Controlador] = None,
+                 semilla: Optional[int] = None, hasta_fin: bool = True) -> ResultadoSimulacion:
+        """
+        Reinicia la partida con `semilla` y la avanza `ticks` pasos.
+        Con hasta_fin=True se detiene antes si termina el juego.
+        """
+        control = self.control
+        controlador = controlador or ControladorQuieto()
+        control.reiniciar(semilla)
+        reloj = time.perf_counter_ns
+        logica_ns = 0
+        max_objetos = 0
+        tick = 0
+        inicio = time.perf_counter()
+        with MedidorGC() as medidor:
+            while tick < ticks and (control.juego_activo or not hasta_fin):
+                dx = controlador.decidir(control, tick)
+                t0 = reloj()
+                if dx:
+                    control.mover_jugador(dx)
+                control.actualizar(int(tick * self.paso_ms))
+                logica_ns += reloj() - t0
+                max_objetos = max(max_objetos, control.num_objetos())
+                tick += 1
+                if self.factor_tiempo is not None:
+                    # Espera hasta el instante real que corresponde a este tick
+                    objetivo = inicio + tick * self.paso_ms / 1000 / self.factor_tiempo
+                    pausa = objetivo - time.perf_counter()
+                    if pausa > 0:
+                        time.sleep(pausa)
+        duracion = time.perf_counter() - inicio
+        simulado = tick * self.paso_ms / 1000
+        puntaje, vidas, activo = control.obtener_estado()
+        return ResultadoSimulacion(
+            ticks=tick,
+            tiempo_simulado_s=simulado,
+            duracion_s=duracion,
+            ns_por_tick=logica_ns / tick if tick else 0.0,
+            veces_tiempo_real=simulado / duracion if duracion else 0.0,
+            puntaje=puntaje,
+            vidas=vidas,
+            juego_activo=activo,
+            max_objetos=max_objetos,
+            gc_colecciones=len(medidor.pausas),
+            gc_por_generacion=medidor.por_generacion,
+            gc_pausa_total_ms=sum(medidor.pausas, 0.0) * 1000,
+            gc_pausa_max_ms=max(medidor.pausas, default=0.0) * 1000,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=36_000, help="Ticks a simular (36000 = 10 min a 60 Hz)")
+    parser.add_argument("--paso-ms", type=float, default=1000 / 60)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--controlador", choices=[*CONTROLADORES, "guion"], default="bot")
+    parser.add_argument("--guion", default="8,8,8,-8,-8,-8", help="Desplazamientos separados por coma")
+    parser.add_argument("--almacen", choices=["auto", "numpy", "lista"], default="auto")
+    parser.add_argument("--vidas", type=int, default=None, help="Vidas iniciales (p. ej. muchas para soak)")
+    parser.add_argument("--factor-tiempo", type=float, default=None,
+                        help="1.0 = tiempo real; sin valor corre lo más rápido posible")
+    parser.add_argument("--seguir", action="store_true", help="No detenerse en GAME OVER")
+    args = parser.parse_args()
+
+    cambios = {"almacen": args.almacen}
+    if args.vidas is not None:
+        cambios["vidas_ini"] = args.vidas
+    simulador = Simulador(args.paso_ms, dataclasses.replace(Ajustes(), **cambios), args.factor_tiempo)
+    if args.controlador == "guion":
+        controlador: Controlador = ControladorGuion([int(m) for m in args.guion.split(",")])
+    else:
+        controlador = CONTROLADORES[args.controlador]()
+    resultado = simulador.ejecutar(args.ticks, controlador, args.semilla, hasta_fin=not args.seguir)
+
+    print("=" * 60)
+    print("SIMULACION SIN VENTANA")
+    print("=" * 60)
+    for campo, valor in dataclasses.asdict(resultado).items():
+        print(f"{campo:<20} {valor:,.2f}" if isinstance(valor, float) else f"{campo:<20} {valor}")
+    if isinstance(simulador.control.almacen, AlmacenLista):
+        print(f"{'pool_objetos':<20} {simulador.control.estadisticas_pool()}")
+
+
+if __name__ == "__main__":
+    main()
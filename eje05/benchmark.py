@@ -0,0 +1,349 @@
+"""
+Benchmark paramétrico de SingletonMeta y de ContadorCompartido.
+Recorre combinaciones de objetivo, número de hilos, iteraciones por hilo y
+perfil de trabajo, repitiendo cada escenario y midiendo con perf_counter_ns:
+rendimiento (ops/s), percentiles de latencia por operación y tiempo de
+espera en el lock. Los resultados se emiten como tabla, JSON o CSV para
+seguir regresiones entre versiones.
+
+Ejemplos:
+    python benchmark.py
+    python benchmark.py --objetivos contador,contador-fragmentado --hilos 1,8,64
+    python benchmark.py --perfiles ninguno,pausa --repeticiones 5 --formato json --salida r.json
+    python benchmark.py --objetivos contador --hilos 1,8,64 --medir-espera-lock
+    python benchmark.py --contencion
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Type
+
+# Agrega la carpeta raiz (..\) para importar patrones.py
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from patrones import SingletonMeta
+from main import ContadorCompartido
+
+
+# ============================================================================
+# Referencia: implementación anterior con un único lock global
+# ============================================================================
+
+
+class SingletonMetaGlobal(type):
+    """Versión previa de SingletonMeta, conservada solo para comparar."""
+    _instances: Dict[Type, Any] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super().__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+class LockInstrumentado:
+    """Lock que acumula el tiempo que cada hilo espera para adquirirlo."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._acumulado = threading.local()
+
+    def acquire(self, *args, **kwargs) -> bool:
+        inicio = time.perf_counter_ns()
+        adquirido = self._lock.acquire(*args, **kwargs)
+        self._acumulado.ns = getattr(self._acumulado, "ns", 0) + time.perf_counter_ns() - inicio
+        return adquirido
+
+    def release(self) -> None:
+        self._lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+    def espera_hilo_ns(self) -> int:
+        """Espera acumulada por el hilo actual."""
+        return getattr(self._acumulado, "ns", 0)
+
+
+# ============================================================================
+# Objetivos y perfiles de trabajo
+# ============================================================================
+
+
+def _preparar_singleton(meta: type) -> Callable[[], Any]:
+    clase = meta("ClaseMedida", (), {})
+    clase()  # La instancia ya existe: se mide solo el camino rápido
+    return clase
+
+
+def _preparar_contador(fragmentado: bool, registrar_historial: bool):
+    def preparar(instrumentar: bool) -> Callable[[], None]:
+        contador = ContadorCompartido()
+        if instrumentar:
+            contador._lock = LockInstrumentado()
+        contador.configurar(fragmentado, registrar_historial)
+        if instrumentar:
+            # configurar() crea el historial: su lock se reemplaza después
+            contador._incrementos_registrados._lock = LockInstrumentado()
+        return contador.incrementar
+    return preparar
+
+
+def _locks_instrumentados() -> List[LockInstrumentado]:
+    """Locks del contador y de su historial que están midiendo la espera."""
+    contador = ContadorCompartido()
+    locks = (contador._lock, contador._incrementos_registrados._lock)
+    return [lock for lock in locks if isinstance(lock, LockInstrumentado)]
+
+
+# Cada objetivo recibe `instrumentar`; los singletons no tienen lock que medir
+OBJETIVOS: Dict[str, Callable[[bool], Callable[[], Any]]] = {
+    "singleton": lambda instrumentar: _preparar_singleton(SingletonMeta),
+    "singleton-global": lambda instrumentar: _preparar_singleton(SingletonMetaGlobal),
+    "contador": _preparar_contador(False, True),
+    "contador-sin-historial": _preparar_contador(False, False),
+    "contador-fragmentado": _preparar_contador(True, False),
+    "contador-fragmentado-historial": _preparar_contador(True, True),
+}
+
+
+def _trabajo_cpu() -> None:
+    sum(range(64))
+
+
+PERFILES: Dict[str, Optional[Callable[[], None]]] = {
+    "ninguno": None,
+    "pausa": lambda: time.sleep(0.0001),  # Igual que PruebasConcurrencia.tarea_incrementar
+    "cpu": _trabajo_cpu,
+}
+
+
+# ============================================================================
+# Ejecución de escenarios
+# ============================================================================
+
+
+def _percentil(ordenadas: List[int], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenadas:
+        return 0.0
+    indice = min(len(ordenadas) - 1, max(0, int(round(p / 100 * len(ordenadas))) - 1))
+    return float(ordenadas[indice])
+
+
+def ejecutar_corrida(objetivo: str, num_hilos: int, iteraciones: int, perfil: str,
+                     medir_espera_lock: bool = False) -> Dict[str, float]:
+    """
+    Una corrida: todos los hilos arrancan juntos y miden cada operación.
+    medir_espera_lock instrumenta el lock del contador y el de su historial (la
+    espera informada es la suma de ambos); agrega su propio costo a cada
+    operación, por eso es opcional.
+    """
+    operacion = OBJETIVOS[objetivo](medir_espera_lock)
+    trabajo = PERFILES[perfil]
+    locks = _locks_instrumentados() if objetivo.startswith("contador") else []
+    barrera = threading.Barrier(num_hilos + 1)
+    latencias: List[List[int]] = [[] for _ in range(num_hilos)]
+    esperas = [0] * num_hilos
+
+    def tarea(indice: int) -> None:
+        propias = latencias[indice]
+        reloj = time.perf_counter_ns
+        barrera.wait()
+        for _ in range(iteraciones):
+            inicio = reloj()
+            operacion()
+            propias.append(reloj() - inicio)
+            if trabajo is not None:
+                trabajo()
+        esperas[indice] = sum(lock.espera_hilo_ns() for lock in locks)
+
+    hilos = [threading.Thread(target=tarea, args=(i,), name=f"Hilo-{i+1}") for i in range(num_hilos)]
+    for hilo in hilos:
+        hilo.start()
+    barrera.wait()
+    inicio = time.perf_counter_ns()
+    for hilo in hilos:
+        hilo.join()
+    duracion_ns = time.perf_counter_ns() - inicio
+
+    if objetivo.startswith("contador"):
+        contador = ContadorCompartido()
+        assert contador.get_valor() == num_hilos * iteraciones, "El contador perdió incrementos"
+        contador._lock = threading.Lock()
+        contador.configurar()  # Deja el Singleton en su modo por defecto
+
+    todas = sorted(l for propias in latencias for l in propias)
+    operaciones = num_hilos * iteraciones
+    return {
+        "ops_s": operaciones / (duracion_ns / 1e9),
+        "p50_ns": _percentil(todas, 50),
+        "p90_ns": _percentil(todas, 90),
+        "p99_ns": _percentil(todas, 99),
+        "max_ns": float(todas[-1]) if todas else 0.0,
+        "espera_lock_ns_op": sum(esperas) / operaciones,
+        "duracion_ms": duracion_ns / 1e6,
+    }
+
+
+def ejecutar_barrido(objetivos: List[str], hilos: List[int], iteraciones: List[int],
+                     perfiles: List[str], repeticiones: int,
+                     medir_espera_lock: bool = False) -> List[Dict[str, Any]]:
+    """Ejecuta todas las combinaciones y resume cada una con la mediana de las repeticiones."""
+    filas: List[Dict[str, Any]] = []
+    for objetivo in objetivos:
+        for perfil in perfiles:
+            for num_hilos in hilos:
+                for num_iteraciones in iteraciones:
+                    corridas = [ejecutar_corrida(objetivo, num_hilos, num_iteraciones, perfil, medir_espera_lock)
+                                for _ in range(repeticiones)]
+                    fila: Dict[str, Any] = {
+                        "objetivo": objetivo,
+                        "perfil": perfil,
+                        "hilos": num_hilos,
+                        "iteraciones": num_iteraciones,
+                        "repeticiones": repeticiones,
+                    }
+                    for metrica in corridas[0]:
+                        fila[metrica] = round(statistics.median(c[metrica] for c in corridas), 2)
+                    fila["ops_s_desv"] = round(statistics.pstdev(c["ops_s"] for c in corridas), 2)
+                    filas.append(fila)
+    return filas
+
+
+# ============================================================================
+# Contención durante la creación (antes/después del lock por clase)
+# ============================================================================
+
+
+def medir_contencion(meta: type, num_hilos: int, espera_init: float = 0.2) -> float:
+    """
+    Crea un Singleton con __init__ lento y, mientras tanto, otros Singletons
+    independientes desde `num_hilos` hilos. Devuelve la latencia media (ms)
+    de creación de estos últimos.
+    """
+
+    class Lento(metaclass=meta):
+        def __init__(self) -> None:
+            time.sleep(espera_init)
+
+    rapidos = [meta(f"Rapido{i}", (), {}) for i in range(num_hilos)]
+    latencias: List[float] = []
+    lock_latencias = threading.Lock()
+    iniciado = threading.Event()
+
+    def crear_lento() -> None:
+        iniciado.set()
+        Lento()
+
+    def crear_rapido(clase: type) -> None:
+        iniciado.wait()
+        time.sleep(0.01)  # Asegura que el lento ya tomó su lock
+        inicio = time.perf_counter_ns()
+        clase()
+        with lock_latencias:
+            latencias.append((time.perf_counter_ns() - inicio) / 1e6)
+
+    hilo_lento = threading.Thread(target=crear_lento)
+    hilos = [threading.Thread(target=crear_rapido, args=(c,)) for c in rapidos]
+    hilo_lento.start()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos + [hilo_lento]:
+        hilo.join()
+    return sum(latencias) / len(latencias)
+
+
+def imprimir_contencion() -> None:
+    """Compara la latencia de creación con lock global y con lock por clase."""
+    metas = [("Antes (lock global)", SingletonMetaGlobal), ("Después (lock por clase)", SingletonMeta)]
+    print("=" * 70)
+    print("CONTENCIÓN: CREACIÓN MIENTRAS OTRO SINGLETON TARDA 200 ms (ms)")
+    print("=" * 70)
+    for num_hilos in (1, 8, 64):
+        fila = [f"{nombre}: {medir_contencion(meta, num_hilos):8.2f}" for nombre, meta in metas]
+        print(f"Hilos {num_hilos:>3} | " + " | ".join(fila))
+
+
+# ============================================================================
+# Salida
+# ============================================================================
+
+
+def escribir_resultados(filas: List[Dict[str, Any]], formato: str, salida) -> None:
+    """Escribe las filas como tabla legible, JSON o CSV."""
+    if formato == "json":
+        json.dump(filas, salida, indent=2, ensure_ascii=False)
+        salida.write("\n")
+    elif formato == "csv":
+        escritor = csv.DictWriter(salida, fieldnames=list(filas[0].keys()))
+        escritor.writeheader()
+        escritor.writerows(filas)
+    else:
+        salida.write(f"{'objetivo':<31} {'perfil':<8} {'hilos':>5} {'iter':>7} {'ops/s':>12} "
+                     f"{'p50 ns':>8} {'p99 ns':>9} {'espera lock ns/op':>18}\n")
+        salida.write("-" * 105 + "\n")
+        for f in filas:
+            salida.write(f"{f['objetivo']:<31} {f['perfil']:<8} {f['hilos']:>5} {f['iteraciones']:>7} "
+                         f"{f['ops_s']:>12,.0f} {f['p50_ns']:>8,.0f} {f['p99_ns']:>9,.0f} "
+                         f"{f['espera_lock_ns_op']:>18,.1f}\n")
+
+
+def _lista(tipo):
+    return lambda texto: [tipo(valor) for valor in texto.split(",") if valor]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de SingletonMeta y ContadorCompartido")
+    parser.add_argument("--objetivos", type=_lista(str), default=list(OBJETIVOS),
+                        help=f"Lista separada por comas de: {', '.join(OBJETIVOS)}")
+    parser.add_argument("--hilos", type=_lista(int), default=[1, 8, 64])
+    parser.add_argument("--iteraciones", type=_lista(int), default=[5_000],
+                        help="Operaciones por hilo (lista separada por comas)")
+    parser.add_argument("--perfiles", type=_lista(str), default=["ninguno"],
+                        help=f"Trabajo entre operaciones: {', '.join(PERFILES)}")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--formato", choices=("tabla", "json", "csv"), default="tabla")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto, la consola)")
+    parser.add_argument("--medir-espera-lock", action="store_true",
+                        help="Instrumenta los locks del contador y de su historial para medir el tiempo de espera")
+    parser.add_argument("--contencion", action="store_true",
+                        help="Mide además la contención de creación (lock global vs por clase)")
+    args = parser.parse_args(argv)
+
+    for objetivo in args.objetivos:
+        if objetivo not in OBJETIVOS:
+            parser.error(f"Objetivo desconocido: {objetivo}")
+    for perfil in args.perfiles:
+        if perfil not in PERFILES:
+            parser.error(f"Perfil desconocido: {perfil}")
+
+    if args.contencion:
+        imprimir_contencion()
+        print()
+    filas = ejecutar_barrido(args.objetivos, args.hilos, args.iteraciones, args.perfiles, args.repeticiones,
+                            args.medir_espera_lock)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8", newline="") as archivo:
+            escribir_resultados(filas, args.formato, archivo)
+        print(f"Resultados guardados en {args.salida}")
+    else:
+        escribir_resultados(filas, args.formato, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
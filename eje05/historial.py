@@ -0,0 +1,137 @@
+"""
+Historial compacto de incrementos para ContadorCompartido.
+Guarda los valores en bloques `array('q')` preasignados y los hilos como
+identificadores enteros internados, con capacidad opcional de anillo e
+instantáneas que comparten la memoria (memoryview) en lugar de copiarla.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+class InstantaneaHistorial:
+    """
+    Vista inmutable del historial en un instante dado.
+    No copia los registros: referencia los bloques del historial, que nunca se
+    modifican en las posiciones ya escritas ni se reutilizan.
+    """
+
+    def __init__(self, bloques: List[Tuple[memoryview, memoryview]], nombres: Tuple[str, ...]) -> None:
+        self._bloques = bloques
+        self._nombres = nombres
+        self._longitud = sum(len(valores) for valores, _ in bloques)
+
+    def __len__(self) -> int:
+        return self._longitud
+
+    def bloques(self) -> Iterator[Tuple[memoryview, memoryview]]:
+        """Recorre los bloques como (valores, ids de hilo) sin copiar."""
+        return iter(self._bloques)
+
+    def nombre_hilo(self, id_hilo: int) -> str:
+        """Traduce un id internado al nombre del hilo."""
+        return self._nombres[id_hilo]
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        nombres = self._nombres
+        for valores, hilos in self._bloques:
+            for valor, id_hilo in zip(valores, hilos):
+                yield valor, nombres[id_hilo]
+
+    def __getitem__(self, indice: Union[int, slice]) -> Union[Tuple[int, str], List[Tuple[int, str]]]:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._longitud))]
+        if indice < 0:
+            indice += self._longitud
+        if not 0 <= indice < self._longitud:
+            raise IndexError("índice de historial fuera de rango")
+        for valores, hilos in self._bloques:
+            if indice < len(valores):
+                return valores[indice], self._nombres[hilos[indice]]
+            indice -= len(valores)
+        raise IndexError("índice de historial fuera de rango")
+
+
+class HistorialCompacto:
+    """
+    Historial de (valor, hilo) con ~12 bytes por registro.
+    capacidad: si se indica, conserva solo los últimos `capacidad` registros.
+    """
+
+    def __init__(self, capacidad: Optional[int] = None, tam_bloque: int = 4096) -> None:
+        if capacidad is not None and capacidad < 1:
+            raise ValueError("La capacidad debe ser >= 1")
+        self.capacidad = capacidad
+        self.tam_bloque = tam_bloque
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._nombres: List[str] = []
+        self.limpiar()
+
+    def limpiar(self) -> None:
+        """Descarta todos los registros (las instantáneas previas siguen válidas)."""
+        with self._lock:
+            self._valores: List[array] = []
+            self._hilos: List[array] = []
+            self._usados = self.tam_bloque  # Fuerza un bloque nuevo en el primer registro
+            self._total = 0  # Registros guardados en los bloques retenidos
+
+    def _nuevo_bloque(self) -> None:
+        """Agrega un bloque preasignado y, en modo anillo, suelta los sobrantes."""
+        self._valores.append(array("q", [0]) * self.tam_bloque)
+        self._hilos.append(array("i", [0]) * self.tam_bloque)
+        self._usados = 0
+        if self.capacidad is not None:
+            # Se suelta el bloque más antiguo solo si aún quedan `capacidad` registros
+            while self._total - self.tam_bloque >= self.capacidad:
+                del self._valores[0]
+                del self._hilos[0]
+                self._total -= self.tam_bloque
+
+    def registrar(self, valor: int, hilo: str) -> None:
+        """Agrega un registro en O(1)."""
+        with self._lock:
+            id_hilo = self._ids.get(hilo)
+            if id_hilo is None:
+                id_hilo = self._ids[hilo] = len(self._nombres)
+                self._nombres.append(hilo)
+            if self._usados == self.tam_bloque:
+                self._nuevo_bloque()
+            self._valores[-1][self._usados] = valor
+            self._hilos[-1][self._usados] = id_hilo
+            self._usados += 1
+            self._total += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._total if self.capacidad is None else min(self._total, self.capacidad)
+
+    def instantanea(self) -> InstantaneaHistorial:
+        """
+        Captura el historial sin copiar registros.
+        El lock solo se mantiene mientras se arma la lista de bloques (O(bloques)).
+        """
+        with self._lock:
+            valores = list(self._valores)
+            hilos = list(self._hilos)
+            usados = self._usados
+            total = self._total
+            nombres = tuple(self._nombres)
+        bloques: List[Tuple[memoryview, memoryview]] = []
+        for i, (bloque_valores, bloque_hilos) in enumerate(zip(valores, hilos)):
+            fin = usados if i == len(valores) - 1 else self.tam_bloque
+            bloques.append((memoryview(bloque_valores)[:fin], memoryview(bloque_hilos)[:fin]))
+        # En modo anillo se omiten los registros más viejos que la capacidad
+        sobrantes = total - self.capacidad if self.capacidad is not None else 0
+        while sobrantes > 0 and bloques:
+            valores_mv, hilos_mv = bloques[0]
+            if sobrantes >= len(valores_mv):
+                sobrantes -= len(valores_mv)
+                del bloques[0]
+            else:
+                bloques[0] = (valores_mv[sobrantes:], hilos_mv[sobrantes:])
+                sobrantes = 0
+        return InstantaneaHistorial(bloques, nombres)
@@ -6,11 +6,12 @@ Valida que múltiples hilos acceden a la misma instancia sin condiciones de carr
 
 from __future__ import annotations
 
+import contextvars
 import sys
 import threading
 import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 # Agrega la carpeta raiz (..\) para importar patrones.py
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -18,6 +19,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from patrones import SingletonMeta
+from historial import HistorialCompacto, InstantaneaHistorial
 
 
 # ============================================================================
@@ -29,38 +31,76 @@ class ContadorCompartido(metaclass=SingletonMeta):
     """
     Singleton que gestiona un contador compartido entre múltiples hilos.
     Usa un lock interno para evitar condiciones de carrera.
+    En modo fragmentado cada hilo incrementa su propia celda sin bloqueo y
+    get_valor() suma todas las celdas.
     """
 
-    def __init__(self) -> None:
-        if getattr(self, "_inicializado", False):
-            return
-        self._inicializado = True
-        self._contador = 0
+    def __init__(self, fragmentado: bool = False, registrar_historial: bool = True,
+                 capacidad_historial: Optional[int] = None) -> None:
         self._lock = threading.Lock()
-        self._incrementos_registrados: List[Tuple[int, str]] = []
+        self.configurar(fragmentado, registrar_historial, capacidad_historial)
+
+    def configurar(self, fragmentado: bool = False, registrar_historial: bool = True,
+                   capacidad_historial: Optional[int] = None) -> None:
+        """
+        Elige la estrategia del contador y lo reinicia.
+        fragmentado: una celda por hilo, los escritores nunca compiten entre sí
+        registrar_historial: guarda (valor, hilo) de cada incremento
+        capacidad_historial: conserva solo los últimos N registros (anillo)
+        """
+        with self._lock:
+            self._fragmentado = fragmentado
+            self._registrar_historial = registrar_historial
+            self._contador = 0
+            self._incrementos_registrados = HistorialCompacto(capacidad_historial)
+            self._local = threading.local()
+            self._celdas: List[List[int]] = []
+
+    def _registrar_celda(self) -> List[int]:
+        """Crea la celda del hilo actual la primera vez que incrementa."""
+        celda = [0]
+        with self._lock:
+            self._celdas.append(celda)
+        self._local.celda = celda
+        return celda
 
     def incrementar(self) -> None:
         """Incrementa el contador de forma thread-safe."""
+        if self._fragmentado:
+            try:
+                celda = self._local.celda
+            except AttributeError:
+                celda = self._registrar_celda()
+            # Solo este hilo escribe en su celda: no hace falta lock
+            celda[0] += 1
+            if self._registrar_historial:
+                # En modo fragmentado el historial guarda el valor de la celda del hilo
+                self._incrementos_registrados.registrar(celda[0], threading.current_thread().name)
+            return
         with self._lock:
             self._contador += 1
-            hilo_actual = threading.current_thread().name
-            self._incrementos_registrados.append((self._contador, hilo_actual))
+            if self._registrar_historial:
+                hilo_actual = threading.current_thread().name
+                self._incrementos_registrados.registrar(self._contador, hilo_actual)
 
     def get_valor(self) -> int:
         """Obtiene el valor actual del contador."""
+        if self._fragmentado:
+            return sum(celda[0] for celda in list(self._celdas))
         with self._lock:
             return self._contador
 
     def reset(self) -> None:
         """Reinicia el contador y el registro."""
-        with self._lock:
-            self._contador = 0
-            self._incrementos_registrados.clear()
+        self.configurar(self._fragmentado, self._registrar_historial,
+                        self._incrementos_registrados.capacidad)
 
-    def obtener_historial(self) -> List[Tuple[int, str]]:
-        """Obtiene el historial de incrementos."""
-        with self._lock:
-            return self._incrementos_registrados.copy()
+    def obtener_historial(self) -> InstantaneaHistorial:
+        """
+        Obtiene el historial de incrementos como instantánea sin copia.
+        Admite len(), iteración e índices/slices de tuplas (valor, hilo).
+        """
+        return self._incrementos_registrados.instantanea()
 
 
 # ============================================================================
@@ -69,11 +109,20 @@ class ContadorCompartido(metaclass=SingletonMeta):
 
 
 class PruebasConcurrencia:
-    """Suite de pruebas para validar la seguridad del Singleton."""
+    """
+    Suite de pruebas para validar la seguridad del Singleton.
+    Los escenarios (hilos x iteraciones) y la pausa entre incrementos son
+    configurables; para mediciones de rendimiento use benchmark.py.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, basica: Tuple[int, int] = (5, 100), estres: Tuple[int, int] = (20, 500),
+                 historial: Tuple[int, int] = (3, 50), pausa: float = 0.0001) -> None:
         self.contador = ContadorCompartido()
         self.resultados: List[str] = []
+        self.basica = basica
+        self.estres = estres
+        self.historial = historial
+        self.pausa = pausa
 
     def agregar_resultado(self, msg: str) -> None:
         """Agrega un resultado a la lista."""
@@ -104,7 +153,8 @@ class PruebasConcurrencia:
         for _ in range(iteraciones):
             self.contador.incrementar()
             # Simula algo de trabajo
-            time.sleep(0.0001)
+            if self.pausa:
+                time.sleep(self.pausa)
 
     def prueba_concurrencia_basica(self) -> bool:
         """
@@ -115,8 +165,7 @@ class PruebasConcurrencia:
         print("=" * 70)
 
         self.contador.reset()
-        num_hilos = 5
-        iteraciones_por_hilo = 100
+        num_hilos, iteraciones_por_hilo = self.basica
         esperado = num_hilos * iteraciones_por_hilo
 
         # Crear hilos
@@ -130,14 +179,14 @@ class PruebasConcurrencia:
             hilos.append(hilo)
 
         # Lanzar todos los hilos
-        inicio = time.time()
+        inicio = time.perf_counter()
         for hilo in hilos:
             hilo.start()
 
         # Esperar a que terminen todos
         for hilo in hilos:
             hilo.join()
-        duracion = time.time() - inicio
+        duracion = time.perf_counter() - inicio
 
         valor_final = self.contador.get_valor()
         resultado = valor_final == esperado
@@ -159,8 +208,7 @@ class PruebasConcurrencia:
         print("=" * 70)
 
         self.contador.reset()
-        num_hilos = 20
-        iteraciones_por_hilo = 500
+        num_hilos, iteraciones_por_hilo = self.estres
         esperado = num_hilos * iteraciones_por_hilo
 
         hilos: List[threading.Thread] = []
@@ -172,12 +220,12 @@ class PruebasConcurrencia:
             )
             hilos.append(hilo)
 
-        inicio = time.time()
+        inicio = time.perf_counter()
         for hilo in hilos:
             hilo.start()
         for hilo in hilos:
             hilo.join()
-        duracion = time.time() - inicio
+        duracion = time.perf_counter() - inicio
 
         valor_final = self.contador.get_valor()
         resultado = valor_final == esperado
@@ -199,8 +247,7 @@ class PruebasConcurrencia:
         print("=" * 70)
 
         self.contador.reset()
-        num_hilos = 3
-        iteraciones = 50
+        num_hilos, iteraciones = self.historial
 
         hilos: List[threading.Thread] = []
         for i in range(num_hilos):
@@ -237,6 +284,62 @@ class PruebasConcurrencia:
         self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
         return resultado
 
+    def prueba_ambitos(self) -> bool:
+        """
+        Prueba 5: Ámbitos por hilo y por contexto, y aislamiento con reinicio.
+        """
+        print("\n" + "=" * 70)
+        print("PRUEBA 5: ÁMBITOS Y REINICIO DEL REGISTRO")
+        print("=" * 70)
+
+        class PorHilo(metaclass=SingletonMeta, ambito="hilo"):
+            pass
+
+        class PorContexto(metaclass=SingletonMeta, ambito="contexto"):
+            pass
+
+        liberadas: List[str] = []
+
+        class Recurso(metaclass=SingletonMeta):
+            def liberar(self) -> None:
+                liberadas.append("Recurso")
+
+        # Ámbito "hilo": cada hilo ve su propia instancia, siempre la misma dentro del hilo
+        por_hilo: List[Tuple[PorHilo, PorHilo]] = []
+        hilos = [threading.Thread(target=lambda: por_hilo.append((PorHilo(), PorHilo())))
+                 for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        unica_por_hilo = all(a is b for a, b in por_hilo)
+        distintas_hilos = len({id(a) for a, _ in por_hilo} | {id(PorHilo())}) == len(hilos) + 1
+
+        # Ámbito "contexto": lo creado en un contexto copiado no se ve en el original,
+        # y un contexto copiado después hereda la instancia existente
+        copia = contextvars.copy_context().run(PorContexto)
+        principal = PorContexto()
+        heredada = contextvars.copy_context().run(PorContexto)
+        distintas_contextos = copia is not principal and principal is PorContexto() and heredada is principal
+
+        # aislado(): instancias nuevas dentro del bloque, liberar() al salir y las de antes vuelven
+        original = ContadorCompartido()
+        recurso = Recurso()
+        with SingletonMeta.aislado():
+            nuevo = ContadorCompartido()
+            aislado_ok = nuevo is not original and nuevo.get_valor() == 0 and Recurso() is not recurso
+        restaurado = ContadorCompartido() is original and Recurso() is recurso
+        Recurso.restablecer()
+        liberado = liberadas == ["Recurso", "Recurso"] and Recurso.instancia_actual() is None
+
+        resultado = all([unica_por_hilo, distintas_hilos, distintas_contextos, aislado_ok, restaurado, liberado])
+        self.agregar_resultado(f"Una instancia por hilo ({len(hilos)} hilos + principal): {unica_por_hilo and distintas_hilos}")
+        self.agregar_resultado(f"Una instancia por contexto: {distintas_contextos}")
+        self.agregar_resultado(f"aislado() da instancias nuevas y restaura las anteriores: {aislado_ok and restaurado}")
+        self.agregar_resultado(f"restablecer() llama a liberar(): {liberado}")
+        self.agregar_resultado(f"✓ Prueba exitosa: {resultado}")
+        return resultado
+
     def ejecutar_todas(self) -> None:
         """Ejecuta todas las pruebas y genera reporte final."""
         print("\n")
@@ -251,6 +354,7 @@ class PruebasConcurrencia:
         resultados_pruebas.append(("Concurrencia Básica", self.prueba_concurrencia_basica()))
         resultados_pruebas.append(("Estrés", self.prueba_concurrencia_extrema()))
         resultados_pruebas.append(("Historial Ordenado", self.prueba_historial_ordenado()))
+        resultados_pruebas.append(("Ámbitos y Reinicio", self.prueba_ambitos()))
 
         # Reporte final
         print("\n" + "=" * 70)
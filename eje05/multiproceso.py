@@ -0,0 +1,214 @@
+"""
+Singleton entre procesos para el contador de eje05.
+SingletonMeta garantiza una instancia por intérprete: con multiprocessing cada
+proceso obtiene su propia copia y los conteos divergen. Este módulo ofrece dos
+formas de compartir el estado:
+  - GestorSingletons (patrones.py): un proceso servidor aloja la única
+    instancia de ContadorCompartido y los trabajadores usan proxies.
+  - ContadorMultiproceso: contador en memoria compartida con una celda por
+    hilo de cada proceso, sin locks en la escritura.
+Incluye un benchmark que compara ambos con la versión con hilos.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Agrega la carpeta raiz (..\) para importar patrones.py
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from patrones import GestorLocal, GestorSingletons, SingletonMeta
+from main import ContadorCompartido
+
+GestorSingletons.compartir(ContadorCompartido)
+
+
+# ============================================================================
+# Contador en memoria compartida
+# ============================================================================
+
+
+class ContadorMultiproceso(metaclass=SingletonMeta):
+    """
+    Singleton cuyo estado vive en memoria compartida.
+    Se crea en el proceso padre antes de lanzar los trabajadores; cada hilo
+    de cada proceso reserva su propia celda y la incrementa sin bloqueo.
+    Se puede pasar a procesos lanzados con "spawn": el thread-local no viaja
+    y cada proceso crea el suyo.
+    """
+
+    def __init__(self, num_celdas: int = 256) -> None:
+        self._celdas = multiprocessing.RawArray("q", num_celdas)
+        self._siguiente = multiprocessing.Value("i", 0)  # Próxima celda libre (con lock)
+        # Cambia en cada reset(): invalida las celdas asignadas antes
+        self._generacion = multiprocessing.RawValue("i", 0)
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        estado = self.__dict__.copy()
+        del estado["_local"]  # threading.local no se puede serializar
+        return estado
+
+    def __setstate__(self, estado: Dict[str, Any]) -> None:
+        self.__dict__.update(estado)
+        self._local = threading.local()
+
+    def _celda_propia(self) -> int:
+        """Índice de la celda del hilo actual en este proceso."""
+        pid = os.getpid()
+        asignada: Optional[Tuple[int, int, int]] = getattr(self._local, "celda", None)
+        # Tras un fork el hilo hereda el thread-local del padre: se compara el pid
+        if asignada is None or asignada[0] != pid or asignada[1] != self._generacion.value:
+            with self._siguiente.get_lock():
+                indice = self._siguiente.value
+                if indice >= len(self._celdas):
+                    raise RuntimeError("ContadorMultiproceso sin celdas libres: aumente num_celdas")
+                self._siguiente.value += 1
+                asignada = (pid, self._generacion.value, indice)
+            self._local.celda = asignada
+        return asignada[2]
+
+    def incrementar(self) -> None:
+        """Incrementa la celda propia; ningún otro hilo ni proceso la escribe."""
+        self._celdas[self._celda_propia()] += 1
+
+    def get_valor(self) -> int:
+        """Suma todas las celdas."""
+        return sum(self._celdas)
+
+    def reset(self) -> None:
+        """
+        Pone todas las celdas en cero y las libera para reasignarlas
+        (no debe haber escritores activos).
+        """
+        with self._siguiente.get_lock():
+            for i in range(len(self._celdas)):
+                self._celdas[i] = 0
+            self._siguiente.value = 0
+            self._generacion.value += 1
+
+
+# ============================================================================
+# Trabajadores
+# ============================================================================
+
+
+def _trabajador_proxy(direccion: Any, clave: bytes, iteraciones: int) -> None:
+    """Incrementa el ContadorCompartido alojado en el servidor del gestor."""
+    gestor = GestorSingletons(address=direccion, authkey=clave)
+    gestor.connect()
+    contador = gestor.obtener(ContadorCompartido)
+    for _ in range(iteraciones):
+        contador.incrementar()
+
+
+def _trabajador_memoria(contador: ContadorMultiproceso, iteraciones: int) -> None:
+    """Incrementa el contador en memoria compartida."""
+    for _ in range(iteraciones):
+        contador.incrementar()
+
+
+def _trabajador_ingenuo(iteraciones: int) -> None:
+    """Usa ContadorCompartido() directamente: cada proceso tiene su propia copia."""
+    contador = ContadorCompartido()
+    for _ in range(iteraciones):
+        contador.incrementar()
+
+
+def _lanzar(objetivo: Callable[..., None], args: Tuple, num_procesos: int) -> float:
+    """Lanza los procesos, espera a que terminen y devuelve la duración en s."""
+    procesos = [multiprocessing.Process(target=objetivo, args=args) for _ in range(num_procesos)]
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join()
+    return time.perf_counter() - inicio
+
+
+# ============================================================================
+# Mediciones
+# ============================================================================
+
+
+def medir_hilos(num_hilos: int, iteraciones: int) -> Tuple[float, int]:
+    """ContadorCompartido fragmentado con hilos en un solo proceso."""
+    with GestorLocal() as gestor:
+        contador = gestor.obtener(ContadorCompartido)
+        contador.configurar(fragmentado=True, registrar_historial=False)
+        hilos = [threading.Thread(target=_trabajador_memoria, args=(contador, iteraciones))
+                 for _ in range(num_hilos)]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        duracion = time.perf_counter() - inicio
+        valor = contador.get_valor()
+        contador.configurar()
+    return duracion, valor
+
+
+def medir_gestor(num_procesos: int, iteraciones: int) -> Tuple[float, int]:
+    """Procesos que comparten ContadorCompartido a través del servidor del gestor."""
+    clave = os.urandom(16)
+    with GestorSingletons(authkey=clave) as gestor:
+        contador = gestor.obtener(ContadorCompartido)
+        contador.configurar(fragmentado=False, registrar_historial=False)
+        duracion = _lanzar(_trabajador_proxy, (gestor.address, clave, iteraciones), num_procesos)
+        return duracion, contador.get_valor()
+
+
+def medir_memoria_compartida(num_procesos: int, iteraciones: int) -> Tuple[float, int]:
+    """Procesos que comparten ContadorMultiproceso en memoria compartida."""
+    contador = ContadorMultiproceso()
+    contador.reset()
+    duracion = _lanzar(_trabajador_memoria, (contador, iteraciones), num_procesos)
+    return duracion, contador.get_valor()
+
+
+def ejecutar_benchmark(procesos: List[int], iteraciones: int = 20_000) -> List[Dict[str, Any]]:
+    """Compara ops/s de hilos, gestor con proxies y memoria compartida."""
+    modos = [
+        ("Hilos (fragmentado)", medir_hilos, iteraciones),
+        # Cada llamada por proxy es un viaje de ida y vuelta al servidor: menos iteraciones
+        ("Procesos + gestor", medir_gestor, max(1, iteraciones // 20)),
+        ("Procesos + memoria compartida", medir_memoria_compartida, iteraciones),
+    ]
+    filas: List[Dict[str, Any]] = []
+    print("=" * 70)
+    print("CONTADOR ENTRE PROCESOS: OPERACIONES POR SEGUNDO")
+    print("=" * 70)
+    for n in procesos:
+        for nombre, medir, por_trabajador in modos:
+            duracion, valor = medir(n, por_trabajador)
+            esperado = n * por_trabajador
+            fila = {"modo": nombre, "trabajadores": n, "ops_s": esperado / duracion,
+                    "valor": valor, "esperado": esperado}
+            filas.append(fila)
+            estado = "✓" if valor == esperado else "✗"
+            print(f"{nombre:<30} N={n:>2} | {fila['ops_s']:>12,.0f} ops/s | {estado} {valor}/{esperado}")
+    return filas
+
+
+def demostrar_divergencia(num_procesos: int = 4, iteraciones: int = 1000) -> None:
+    """Muestra que sin modo compartido cada proceso cuenta en su propia copia."""
+    contador = ContadorCompartido()
+    contador.reset()
+    _lanzar(_trabajador_ingenuo, (iteraciones,), num_procesos)
+    print(f"Singleton por proceso: esperado {num_procesos * iteraciones}, "
+          f"el padre ve {contador.get_valor()} (cada proceso contó en su copia)")
+
+
+if __name__ == "__main__":
+    demostrar_divergencia()
+    print()
+    ejecutar_benchmark([1, 2, 4, 8])
@@ -1,16 +1,167 @@
+import contextvars
 import threading
-from typing import Any, Dict, Type
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+# Ámbitos de una clase Singleton: una instancia por proceso (por defecto),
+# por hilo o por contexto de contextvars (p. ej. por tarea de asyncio)
+AMBITOS = ("proceso", "hilo", "contexto")
+
+
+def _liberar(instancia: Any) -> None:
+    # Gancho de ciclo de vida: si la clase define liberar(), cierra sus recursos
+    liberar = getattr(type(instancia), "liberar", None)
+    if callable(liberar):
+        liberar(instancia)
+
 
 class SingletonMeta(type):
+    # Registro del ámbito "proceso"
     _instances: Dict[Type, Any] = {}
-    _lock: threading.Lock = threading.Lock()
+    _locks: Dict[Type, threading.Lock] = {}
+    # Registro del ámbito "hilo": un diccionario por hilo
+    _local = threading.local()
+    # Registro del ámbito "contexto": nunca se modifica en su lugar, se copia al
+    # escribir, así los contextos copiados (tareas hijas) no se pisan entre sí
+    _contexto: "contextvars.ContextVar[Optional[Dict[Type, Any]]]" = contextvars.ContextVar(
+        "singletons", default=None
+    )
+
+    def __new__(mcs, nombre, bases, atributos, ambito: Optional[str] = None, **kwargs):
+        return super().__new__(mcs, nombre, bases, atributos, **kwargs)
+
+    def __init__(cls, nombre, bases, atributos, ambito: Optional[str] = None, **kwargs):
+        super().__init__(nombre, bases, atributos, **kwargs)
+        if ambito is not None and ambito not in AMBITOS:
+            raise ValueError(f"Ámbito desconocido {ambito!r}; use uno de {AMBITOS}")
+        # class X(metaclass=SingletonMeta, ambito="hilo"); sin ámbito se hereda el de la base
+        cls._ambito = ambito or getattr(cls, "_ambito", "proceso")
+        # Un lock por clase: un __init__ lento (p. ej. ConexionBD) no bloquea
+        # la creación de otros Singletons no relacionados
+        SingletonMeta._locks[cls] = threading.Lock()
+
+    def _registro(cls) -> Dict[Type, Any]:
+        # Diccionario del ámbito de la clase visto desde el hilo y contexto actuales
+        ambito = cls._ambito
+        if ambito == "proceso":
+            return SingletonMeta._instances
+        if ambito == "hilo":
+            instancias = getattr(SingletonMeta._local, "instancias", None)
+            if instancias is None:
+                instancias = SingletonMeta._local.instancias = {}
+            return instancias
+        return SingletonMeta._contexto.get() or {}
 
     def __call__(cls, *args, **kwargs):
-        # Primer chequeo sin bloqueo 
-        if cls not in cls._instances:
-            # Bloqueo para garantizar atomicidad en la creación
-            with cls._lock:
-                # Double-Checked Locking
-                if cls not in cls._instances:
-                    cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
\ No newline at end of file
+        # Camino rápido sin bloqueo: una sola consulta al diccionario del ámbito
+        # (el de proceso, el más común, sin pasar por _registro())
+        if cls._ambito == "proceso":
+            instancia = SingletonMeta._instances.get(cls)
+        else:
+            instancia = cls._registro().get(cls)
+        if instancia is not None:
+            return instancia
+        # Bloqueo propio de la clase para garantizar atomicidad en la creación
+        with cls._locks[cls]:
+            # Double-Checked Locking
+            instancia = cls._registro().get(cls)
+            if instancia is None:
+                instancia = super().__call__(*args, **kwargs)
+                if cls._ambito == "contexto":
+                    SingletonMeta._contexto.set({**cls._registro(), cls: instancia})
+                else:
+                    cls._registro()[cls] = instancia
+        return instancia
+
+    def instancia_actual(cls) -> Optional[Any]:
+        # Instancia del ámbito actual sin crearla (None si todavía no existe)
+        return cls._registro().get(cls)
+
+    def restablecer(cls, liberar: bool = True) -> Optional[Any]:
+        # Olvida la instancia del ámbito actual: la próxima llamada crea una nueva.
+        # Con liberar=True llama antes a su liberar() (cerrar archivos, conexiones...)
+        with cls._locks[cls]:
+            instancia = cls._registro().get(cls)
+            if instancia is None:
+                return None
+            if cls._ambito == "contexto":
+                restantes = dict(cls._registro())
+                del restantes[cls]
+                SingletonMeta._contexto.set(restantes)
+            else:
+                del cls._registro()[cls]
+        if liberar:
+            _liberar(instancia)
+        return instancia
+
+    @staticmethod
+    def restablecer_todos(liberar: bool = True) -> List[Any]:
+        # Restablece todo lo visible desde aquí: el contexto actual, el hilo actual
+        # y el proceso, en orden inverso de creación (lo último creado se libera primero)
+        registros = [SingletonMeta._contexto.get() or {},
+                     getattr(SingletonMeta._local, "instancias", {}),
+                     SingletonMeta._instances]
+        restablecidas = []
+        for registro in registros:
+            for clase in reversed(list(registro)):
+                instancia = clase.restablecer(liberar)
+                if instancia is not None:
+                    restablecidas.append(instancia)
+        return restablecidas
+
+    @staticmethod
+    @contextmanager
+    def aislado() -> Iterator[None]:
+        # Ámbito de prueba: dentro del bloque los registros del proceso, del hilo
+        # actual y del contexto actual empiezan vacíos; al salir se liberan las
+        # instancias creadas dentro y vuelven las de antes. También sirve como
+        # decorador (@SingletonMeta.aislado()). No debe haber otros hilos creando
+        # Singletons de proceso mientras tanto.
+        proceso = SingletonMeta._instances
+        hilo = getattr(SingletonMeta._local, "instancias", None)
+        SingletonMeta._instances = {}
+        SingletonMeta._local.instancias = {}
+        token = SingletonMeta._contexto.set({})
+        try:
+            yield
+        finally:
+            SingletonMeta.restablecer_todos()
+            SingletonMeta._contexto.reset(token)
+            SingletonMeta._instances = proceso
+            if hilo is None:
+                del SingletonMeta._local.instancias
+            else:
+                SingletonMeta._local.instancias = hilo
+
+
+class GestorSingletons(BaseManager):
+    # Servidor (proceso aparte) que aloja una única instancia de cada clase
+    # compartida; los demás procesos reciben proxies hacia esa misma instancia
+    @classmethod
+    def compartir(cls, clase: Type) -> Type:
+        # Dentro del servidor clase() pasa por SingletonMeta: siempre la misma instancia
+        cls.register(clase.__name__, callable=clase)
+        return clase
+
+    def obtener(self, clase: Type) -> Any:
+        return getattr(self, clase.__name__)()
+
+
+class GestorLocal:
+    # Sustituto en proceso con la misma interfaz que GestorSingletons,
+    # útil en pruebas donde no se quiere levantar un servidor
+    def start(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+    def obtener(self, clase: Type) -> Any:
+        return clase()
+
+    def __enter__(self) -> "GestorLocal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()